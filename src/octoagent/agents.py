@@ -1,31 +1,44 @@
 """
 Defines the agent classes used in the OctoAgent workflow.
 """
+import asyncio
+import functools
+import json
 import logging
 import os
+import re
 
-from typing import Optional
-from agents import Agent as BaseAgent, Runner
-from .tools import (
-    download_github_issue,
-    create_pr_branch,
-    post_comment_to_github,
-    list_repository_files,
-    commit_files_to_branch,
-    delete_file_from_branch,
-)
+from dataclasses import dataclass
+from importlib import resources
+from typing import Any, AsyncIterator, ClassVar, Dict, List, Optional, Sequence, Tuple
+from agents import Agent as BaseAgent, Runner, set_default_openai_client
+# The SDK (pinned in requirements.txt) only exposes the getter for the client
+# set with set_default_openai_client from this module.
+from agents.models._openai_shared import get_default_openai_client
+from openai import AsyncOpenAI
+from . import tools
+from .cache import cache_key, llm_cache
 
 
 logger = logging.getLogger(__name__)
 
-PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+# The prompts ship inside the package; resolving them through the package's loader
+# also works when it is imported from a zip archive.
+PROMPTS_DIR = resources.files(__package__).joinpath("prompts")
+# Upper bound on concurrent LLM calls across all agents in this process.
+LLM_CONCURRENCY = int(os.environ.get("OCTOAGENT_LLM_CONCURRENCY", "8"))
 
+@functools.lru_cache(maxsize=None)
 def load_prompt(file_name: str) -> str:
-    """Loads a prompt from the prompts directory."""
-    file_path = os.path.join(PROMPTS_DIR, file_name)
+    """
+    Loads a prompt from the prompts directory.
+
+    Each file is read once per process; later calls, including for a
+    missing file (which is logged once), return the cached result.
+    """
+    file_path = PROMPTS_DIR.joinpath(file_name)
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read().strip()
+        return file_path.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
         logger.error(f"Prompt file not found: {file_path}")
         # Return a generic error or a very basic default instruction
@@ -35,105 +48,746 @@ def load_prompt(file_name: str) -> str:
         return "Error: Could not load prompt due to an unexpected error."
 
 
+# Agent instructions are read once at import, not on every instantiation.
+_ISSUE_TRIAGER_INSTRUCTIONS = load_prompt("issue_triager_agent.md")
+_ISSUE_ANALYSIS_INSTRUCTIONS = load_prompt("issue_analysis_agent.md")
+_PLANNER_INSTRUCTIONS = load_prompt("planner_agent.md")
+_FILE_IDENTIFIER_INSTRUCTIONS = load_prompt("file_identifier_agent.md")
+_CODE_PROPOSER_INSTRUCTIONS = load_prompt("code_proposer_agent.md")
+_CHANGE_EXPLAINER_INSTRUCTIONS = load_prompt("change_explainer_agent.md")
+_BATCH_CHANGE_EXPLAINER_INSTRUCTIONS = load_prompt("batch_change_explainer_agent.md")
+_CODE_COMMITTER_INSTRUCTIONS = load_prompt("code_committer_agent.md")
+_BRANCH_CREATOR_INSTRUCTIONS = load_prompt("branch_creator_agent.md")
+_BRANCH_AND_COMMIT_INSTRUCTIONS = load_prompt("branch_and_commit_agent.md")
+_COMMENT_POSTER_INSTRUCTIONS = load_prompt("comment_poster_agent.md")
+
+# The reviewer template is read once at import and only formatted per instance.
+# Its static instructions come first and the review aspect is filled in at the
+# end, so every reviewer shares the same prompt prefix; keep it that way when
+# editing the template (nothing instance-specific before the static block), or
+# the provider's automatic prefix cache stops matching.
+_CODE_REVIEWER_TEMPLATE = load_prompt("code_reviewer_agent_template.md")
+_MULTI_ASPECT_REVIEWER_TEMPLATE = load_prompt("multi_aspect_reviewer_agent.md")
+
+
+@functools.cache
+def _tools(*names: str) -> Tuple[Any, ...]:
+    """Returns the named tools as a tuple, built once per combination."""
+    return tuple(getattr(tools, name) for name in names)
+
+
+@functools.lru_cache(maxsize=32)
+def _reviewer_name(review_aspect: str) -> str:
+    """Returns the agent name for a review aspect, building each name once."""
+    return f"{review_aspect.replace(' ', '')}Reviewer"
+
+
+@functools.lru_cache(maxsize=32)
+def _reviewer_instructions(review_aspect: str) -> str:
+    """
+    Returns the reviewer template formatted for an aspect.
+
+    Aspects are caller-supplied strings, so the cache is bounded; the few
+    aspects a workflow uses stay cached.
+    """
+    return _CODE_REVIEWER_TEMPLATE.format(
+        review_aspect=review_aspect,
+        review_aspect_capitalized=review_aspect.capitalize()
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _multi_aspect_reviewer_instructions(review_aspects: Tuple[str, ...]) -> str:
+    """Returns the multi-aspect reviewer template formatted for a set of aspects, formatting each set once."""
+    return _MULTI_ASPECT_REVIEWER_TEMPLATE.format(
+        review_aspects=", ".join(f"'{aspect}'" for aspect in review_aspects),
+        response_shape=json.dumps({aspect: "<review>" for aspect in review_aspects})
+    )
+
+
 class ReusableAgent(BaseAgent):
     """
     A reusable base agent class that can be extended for specific use cases.
     """
     DEFAULT_INSTRUCTIONS = "You are a helpful assistant."
-    
+    # Whether this agent's responses may be served from the shared response
+    # cache. Only agents whose output is determined by their input opt in.
+    CACHE_RESPONSES = False
+    # Names of the tools in `tools.py` this agent uses, unless `tools` is passed explicitly.
+    TOOL_NAMES: ClassVar[Tuple[str, ...]] = ()
+    # One Runner shared by every agent; see `_get_runner`.
+    _shared_runner: ClassVar[Optional[Runner]] = None
+    # One event loop shared by the synchronous entry points; see `_run_sync`.
+    _sync_loop: ClassVar[Optional[asyncio.AbstractEventLoop]] = None
+    # The semaphore bounding concurrent LLM calls and the loop it was created on; see `llm_semaphore`.
+    _llm_semaphore: ClassVar[Optional[asyncio.Semaphore]] = None
+    _llm_semaphore_loop: ClassVar[Optional[asyncio.AbstractEventLoop]] = None
+
     def __init__(self, name: str, instructions: Optional[str] = None, **kwargs):
         final_instructions = instructions if instructions is not None else self.DEFAULT_INSTRUCTIONS
+        if self.TOOL_NAMES and "tools" not in kwargs:
+            kwargs["tools"] = list(_tools(*self.TOOL_NAMES))
         super().__init__(name=name, instructions=final_instructions, **kwargs)
-        self.runner = Runner()
-        logger.debug(f"ReusableAgent '{name}' initialized with model '{kwargs.get('model', 'default')}'. Instructions loaded: {'Yes' if instructions else 'No (using default)'}")
+        # Agents are built often enough that the message is only formatted when debug logging is on.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "ReusableAgent '%s' initialized with model '%s'. Instructions loaded: %s",
+                name, kwargs.get('model', 'default'), 'Yes' if instructions else 'No (using default)'
+            )
+
+    @classmethod
+    def _get_runner(cls) -> Runner:
+        """Returns the Runner shared by all agents, creating it on first use."""
+        if ReusableAgent._shared_runner is None:
+            ReusableAgent._shared_runner = Runner()
+        return ReusableAgent._shared_runner
+
+    @classmethod
+    def llm_semaphore(cls) -> asyncio.Semaphore:
+        """
+        Returns the semaphore that bounds concurrent LLM calls.
+
+        `run_agent` holds it for the duration of each model call, so fanning
+        out many agents (concurrent reviewers, several issues at once) keeps
+        bursts of requests below the provider's rate limits. The limit is
+        read from `OCTOAGENT_LLM_CONCURRENCY` (default 8). A semaphore cannot
+        be shared across event loops, so one is created per running loop.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = ReusableAgent._llm_semaphore
+        if semaphore is None or ReusableAgent._llm_semaphore_loop is not loop:
+            semaphore = asyncio.Semaphore(max(1, LLM_CONCURRENCY))
+            ReusableAgent._llm_semaphore = semaphore
+            ReusableAgent._llm_semaphore_loop = loop
+        return semaphore
+
+    @classmethod
+    def _run_sync(cls, coro, caller: str, alternative: str) -> Any:
+        """
+        Runs a coroutine to completion on the loop shared by synchronous callers.
+
+        The loop is created on first use and kept open, so sequential sync
+        calls do not each set up and tear down an event loop, and clients
+        bound to the loop (such as pooled HTTP connections) stay usable.
+
+        Parameters
+        ----------
+        coro : coroutine
+            The coroutine to run.
+        caller : str
+            The name of the calling method, for the error message.
+        alternative : str
+            The coroutine method to await instead, for the error message.
+
+        Raises
+        ------
+        RuntimeError
+            If called while an event loop is running in this thread, where
+            blocking on another loop would stall the running one.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            coro.close()
+            raise RuntimeError(f"{caller}() was called from a running event loop; await {alternative}() instead.")
+        if ReusableAgent._sync_loop is None or ReusableAgent._sync_loop.is_closed():
+            ReusableAgent._sync_loop = asyncio.new_event_loop()
+        return ReusableAgent._sync_loop.run_until_complete(coro)
+
+    @classmethod
+    async def warm_up(cls, timeout: float = 10.0) -> bool:
+        """
+        Opens a connection to the LLM provider ahead of the first agent run.
+
+        Sends the agents' default OpenAI client a cheap request (listing
+        models), so the DNS lookup and TLS handshake happen while other work
+        is in flight and the first agent run finds a live pooled connection.
+        A default client configured by the host application (e.g., with a
+        custom base URL or a proxy) is warmed up as is; only if there is none
+        is a new one installed. Failures are logged and otherwise ignored; the
+        agent runs will report real errors.
+
+        Call this from the event loop the agents will run on, since the
+        client's connection pool is bound to it.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds to wait for the warm-up request, by default 10.
+
+        Returns
+        -------
+        bool
+            True if the warm-up request succeeded.
+        """
+        cls._get_runner()
+        try:
+            client = get_default_openai_client()
+            if client is None:
+                client = AsyncOpenAI()
+                set_default_openai_client(client)
+            await client.models.list(timeout=timeout)
+        except Exception as e:
+            logger.debug(f"LLM connection warm-up failed: {e!r}")
+            return False
+        logger.debug("LLM connection warmed up.")
+        return True
+
+    @property
+    def runner(self) -> Runner:
+        """The shared Runner used to run this agent."""
+        return self._get_runner()
+
+    def response_cache_key(self, user_input: str, kind: str = "final_output") -> Optional[str]:
+        """
+        Returns the response-cache key for an input to this agent.
+
+        Parameters
+        ----------
+        user_input : str
+            The input the agent would be run on.
+        kind : str, optional
+            What is cached under the key (e.g., 'final_output' or 'run_result'),
+            by default "final_output".
+
+        Returns
+        -------
+        str or None
+            The cache key, or None if responses of this agent are not cached,
+            including when it is configured with a sampling temperature above
+            zero, since its responses are then meant to vary.
+        """
+        if not (self.CACHE_RESPONSES and llm_cache.enabled):
+            return None
+        temperature = getattr(self.model_settings, "temperature", None)
+        if temperature is not None and temperature > 0:
+            return None
+        return cache_key(kind, self.name, str(self.model), self.instructions, user_input)
 
     async def run_agent(self, user_input: str, **kwargs):
-        result = await self.runner.run(self, input=user_input, **kwargs)
-        return result.final_output
+        key = None if kwargs else self.response_cache_key(user_input)
+        if key is None:
+            return await self._run_uncached(user_input, **kwargs)
+        cached_output = llm_cache.get(key)
+        if cached_output is not None:
+            return cached_output
+        final_output = await self._run_uncached(user_input)
+        llm_cache.set(key, final_output)
+        return final_output
+
+    async def _run_uncached(self, user_input: str, **kwargs):
+        """Runs the agent under the LLM semaphore and returns its final output."""
+        async with self.llm_semaphore():
+            return (await self._get_runner().run(self, input=user_input, **kwargs)).final_output
+
+    def start_streamed_run(self, user_input: str, **kwargs):
+        """
+        Starts a streamed run of the agent.
+
+        Returns
+        -------
+        agents.RunResultStreaming
+            The streaming run. Iterate `text_deltas(run)` for its output
+            text, or call `run.cancel()` to stop it early.
+        """
+        return self._get_runner().run_streamed(self, input=user_input, **kwargs)
+
+    @staticmethod
+    async def text_deltas(streamed_run) -> AsyncIterator[str]:
+        """Yields the output text of a streamed run as it is generated."""
+        async for event in streamed_run.stream_events():
+            if event.type == "raw_response_event" and getattr(event.data, "type", None) == "response.output_text.delta":
+                yield event.data.delta
+
+    async def run_agent_streamed(self, user_input: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Runs the agent and yields its output text as it is generated.
+
+        Stopping the iteration early does not cancel the underlying run; use
+        `start_streamed_run` and `text_deltas` when the run must be cancelled.
+        """
+        async for delta in self.text_deltas(self.start_streamed_run(user_input, **kwargs)):
+            yield delta
+
+    @staticmethod
+    async def run_many(agents: Sequence["ReusableAgent"], inputs: Sequence[str], concurrency: Optional[int] = None) -> List[str]:
+        """
+        Runs several agents concurrently.
+
+        Parameters
+        ----------
+        agents : sequence of ReusableAgent
+            The agents to run, e.g. reviewers for different aspects.
+        inputs : sequence of str
+            The input for each agent, in the same order.
+        concurrency : int, optional
+            The maximum number of agents running at once. By default, all
+            agents start at once.
+
+        Returns
+        -------
+        list of str
+            The final output of each agent, in the order of `agents`.
+        """
+        if len(agents) != len(inputs):
+            raise ValueError(f"run_many() got {len(agents)} agents but {len(inputs)} inputs.")
+        if not concurrency:
+            return list(await asyncio.gather(*(agent.run_agent(user_input) for agent, user_input in zip(agents, inputs))))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(agent: "ReusableAgent", user_input: str) -> str:
+            async with semaphore:
+                return await agent.run_agent(user_input)
+
+        return list(await asyncio.gather(*(run_one(agent, user_input) for agent, user_input in zip(agents, inputs))))
+
+    @classmethod
+    def run_batch_sync(cls, tasks: Sequence[Tuple["ReusableAgent", str]]) -> List[str]:
+        """
+        Runs several agents from synchronous code on a single event loop.
+
+        Unlike calling `run_agent_sync` in a loop, the agents run
+        concurrently on the shared event loop.
+
+        Parameters
+        ----------
+        tasks : sequence of tuple of (ReusableAgent, str)
+            The agents to run and their inputs.
+
+        Returns
+        -------
+        list of str
+            The final output of each agent, in the order of `tasks`.
+
+        Raises
+        ------
+        RuntimeError
+            If called while an event loop is running in this thread.
+        """
+        agents, inputs = zip(*tasks) if tasks else ((), ())
+        return cls._run_sync(cls.run_many(agents, inputs), "run_batch_sync", "ReusableAgent.run_many")
+
+    def run_cached_sync(self, user_input: str, *, key: Optional[str] = None) -> str:
+        """
+        Runs the agent from synchronous code, reusing cached responses.
+
+        Responses are kept in the shared response cache (`cache.llm_cache`,
+        bounded and expiring), and on disk as well when it is persisted, so
+        identical runs are answered without calling the model. Only agents
+        whose responses may be cached (see `response_cache_key`) are cached,
+        so agents that act through tools always run. Set the
+        `OCTOAGENT_NO_CACHE` environment variable to a true value to bypass
+        the cache.
+
+        Parameters
+        ----------
+        user_input : str
+            The input to the agent.
+        key : str, optional
+            The cache key. By default, the key `response_cache_key` returns.
+
+        Returns
+        -------
+        str
+            The agent's final output, as text whether or not it was cached.
+        """
+        default_key = self.response_cache_key(user_input)
+        if default_key is None or os.environ.get("OCTOAGENT_NO_CACHE", "").lower() in ("1", "true", "yes"):
+            key = None
+        elif key is None:
+            key = default_key
+        if key is not None:
+            cached_output = llm_cache.get(key)
+            if cached_output is not None:
+                return str(cached_output)
+        final_output = str(self._run_sync(self._run_uncached(user_input), "run_cached_sync", f"{type(self).__name__}.run_agent"))
+        if key is not None:
+            llm_cache.set(key, final_output)
+        return final_output
 
     def run_agent_sync(self, user_input: str, **kwargs):
-        result = self.runner.run_sync(self, input=user_input, **kwargs)
-        return result.final_output
+        """
+        Runs the agent from synchronous code.
+
+        This is a convenience for scripts; the workflow itself is async and
+        should await `run_agent` instead. All synchronous calls share one
+        event loop. Each call blocks until its agent finishes, so to run
+        several agents concurrently, await `run_many` from async code or call
+        `run_batch_sync` from sync code.
+
+        Raises
+        ------
+        RuntimeError
+            If called while an event loop is running in this thread, where
+            blocking on a new loop would stall the running one.
+        """
+        return self._run_sync(self.run_agent(user_input, **kwargs), "run_agent_sync", f"{type(self).__name__}.run_agent")
 
 
 class IssueTriagerAgent(ReusableAgent):
     """An agent that triages GitHub issues."""
+    CACHE_RESPONSES = True
+    TOOL_NAMES = ("download_github_issue",)
+
     def __init__(self, **kwargs):
-        instructions = load_prompt("issue_triager_agent.md")
-        super().__init__(name="IssueTriager", instructions=instructions, tools=[download_github_issue], **kwargs)
+        instructions = _ISSUE_TRIAGER_INSTRUCTIONS
+        super().__init__(name="IssueTriager", instructions=instructions, **kwargs)
+
+
+class IssueAnalysisAgent(ReusableAgent):
+    """
+    An agent that triages an issue, plans its resolution and identifies the
+    target files in a single run, returning the results as JSON.
+    """
+    CACHE_RESPONSES = True
+    TOOL_NAMES = ("download_github_issue", "list_repository_files")
+
+    def __init__(self, **kwargs):
+        instructions = _ISSUE_ANALYSIS_INSTRUCTIONS
+        super().__init__(name="IssueAnalyzer", instructions=instructions, **kwargs)
 
 
 class PlannerAgent(ReusableAgent):
     """
     An agent that analyzes a triaged GitHub issue and creates a plan.
     """
+    CACHE_RESPONSES = True
+
     def __init__(self, **kwargs):
-        instructions = load_prompt("planner_agent.md")
+        instructions = _PLANNER_INSTRUCTIONS
         super().__init__(name="PlannerAgent", instructions=instructions, **kwargs)
 
 
 class FileIdentifierAgent(ReusableAgent):
     """An agent that identifies the target file(s) to fix for an issue."""
+    TOOL_NAMES = ("list_repository_files",)
+
     def __init__(self, **kwargs):
-        instructions = load_prompt("file_identifier_agent.md")
-        super().__init__(name="FileIdentifierAgent", instructions=instructions, tools=[list_repository_files], **kwargs)
+        instructions = _FILE_IDENTIFIER_INSTRUCTIONS
+        super().__init__(name="FileIdentifierAgent", instructions=instructions, **kwargs)
 
 class CodeProposerAgent(ReusableAgent):
     """An agent that proposes code solutions."""
     def __init__(self, **kwargs):
-        instructions = load_prompt("code_proposer_agent.md")
+        instructions = _CODE_PROPOSER_INSTRUCTIONS
         super().__init__(name="CodeProposer", instructions=instructions, **kwargs)
 
 class ChangeExplainerAgent(ReusableAgent):
     """An agent that explains code changes."""
     def __init__(self, **kwargs):
-        instructions = load_prompt("change_explainer_agent.md")
+        instructions = _CHANGE_EXPLAINER_INSTRUCTIONS
         super().__init__(name="ChangeExplainerAgent", instructions=instructions, **kwargs)
 
 
+class BatchChangeExplainerAgent(ReusableAgent):
+    """
+    An agent that explains several code changes in one run.
+
+    It takes a JSON array of changes and returns a JSON array with one
+    explanation per change; see `build_input` and `parse_output`.
+    """
+    def __init__(self, **kwargs):
+        instructions = _BATCH_CHANGE_EXPLAINER_INSTRUCTIONS
+        super().__init__(name="BatchChangeExplainerAgent", instructions=instructions, **kwargs)
+
+    @staticmethod
+    def build_input(issue_title: str, issue_body: str, plan: str, changes: List[Dict[str, str]]) -> str:
+        """
+        Builds the agent input for a list of changes.
+
+        Parameters
+        ----------
+        issue_title : str
+            The title of the GitHub issue.
+        issue_body : str
+            The body of the GitHub issue.
+        plan : str
+            The overall plan for the issue.
+        changes : list of dict
+            The changes, each with 'file_path', 'action', 'original' and 'new'.
+
+        Returns
+        -------
+        str
+            The input text.
+        """
+        return (
+            f"Original GitHub Issue Title: {issue_title}\nOriginal GitHub Issue Body:\n{issue_body}\n\n"
+            f"Overall Plan:\n{plan}\n\nFile Changes:\n{json.dumps(changes, indent=2)}\n\n"
+            f"Explain each of these {len(changes)} changes."
+        )
+
+    @staticmethod
+    def parse_output(output: Optional[str], file_paths: List[str]) -> Optional[List[str]]:
+        """
+        Extracts the explanations from the agent's output.
+
+        Parameters
+        ----------
+        output : str or None
+            The agent's final output, optionally wrapped in a code fence.
+        file_paths : list of str
+            The paths of the explained changes, in input order.
+
+        Returns
+        -------
+        list of str or None
+            One explanation per path, in the same order, or None if the output
+            is not a JSON array matching the input.
+        """
+        text = (output or "").strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+        try:
+            items = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(items, list) or len(items) != len(file_paths):
+            return None
+        explanations = []
+        for item, file_path in zip(items, file_paths):
+            if not isinstance(item, dict) or item.get("file_path") != file_path or not isinstance(item.get("explanation"), str):
+                return None
+            explanations.append(item["explanation"])
+        return explanations
+
+
 class CodeReviewerAgent(ReusableAgent):
     """
     An agent that reviews proposed file operations.
+
+    Reviews are streamed, and the stream is cut short as soon as an approval
+    verdict arrives.
     """
+    CACHE_RESPONSES = True
+    # Reviewers start their response with one of these verdicts; an approval is the whole response.
+    VERDICT_RE = re.compile(r"\s*\**\s*(LGTM|Satisfactory|Approved|Needs revision)", re.IGNORECASE)
+    # Stop looking for a verdict once this much of a review has streamed in without one.
+    VERDICT_MAX_CHARS = 40
+
     def __init__(self, review_aspect: str = "general code quality", **kwargs):
-        template = load_prompt("code_reviewer_agent_template.md")
-        formatted_instructions = template.format(
-            review_aspect=review_aspect,
-            review_aspect_capitalized=review_aspect.capitalize()
+        super().__init__(
+            name=_reviewer_name(review_aspect),
+            instructions=_reviewer_instructions(review_aspect),
+            **kwargs
         )
+
+    async def review_streamed(self, user_input: str) -> Tuple[str, Any]:
+        """
+        Streams a review and stops reading as soon as the reviewer approves.
+
+        Approvals consist of the verdict alone, so the stream is cancelled once
+        the verdict prefix has been decoded. Reviews asking for revisions are
+        read to the end.
+
+        Returns
+        -------
+        tuple of (str, agents.RunResultStreaming or None)
+            The review text, and the finished run (for usage accounting), or
+            None if the run was cancelled on an approval and never completed.
+        """
+        review_text_parts: List[str] = []
+        verdict_decided = False
+        streamed_run = self.start_streamed_run(user_input)
+        # Without an early approval the stream is read to the end, so the run's
+        # final output and usage are complete.
+        try:
+            async for delta in self.text_deltas(streamed_run):
+                if verdict_decided:
+                    continue
+                review_text_parts.append(delta)
+                review_so_far = "".join(review_text_parts)
+                verdict_match = self.VERDICT_RE.match(review_so_far)
+                if verdict_match and verdict_match.group(1).lower() != "needs revision":
+                    logger.debug(f"[{self.name}] Approval verdict received; cancelling the rest of the stream.")
+                    streamed_run.cancel()
+                    return review_so_far, None
+                verdict_decided = bool(verdict_match) or len(review_so_far) > self.VERDICT_MAX_CHARS
+        except asyncio.CancelledError:
+            # The run generates in a background task; stop it along with this review.
+            streamed_run.cancel()
+            raise
+        return str(streamed_run.final_output), streamed_run
+
+    async def run_agent(self, user_input: str, **kwargs):
+        if kwargs:
+            return await super().run_agent(user_input, **kwargs)
+        key = self.response_cache_key(user_input)
+        if key is not None:
+            cached_output = llm_cache.get(key)
+            if cached_output is not None:
+                return cached_output
+        async with self.llm_semaphore():
+            review_text, _ = await self.review_streamed(user_input)
+        if key is not None:
+            llm_cache.set(key, review_text)
+        return review_text
+
+
+class MultiAspectReviewerAgent(ReusableAgent):
+    """
+    An agent that reviews proposed file operations for several aspects in one run.
+
+    It replaces one `CodeReviewerAgent` run per aspect with a single run that
+    returns a JSON object with one review per aspect; see `parse_output`.
+    """
+    CACHE_RESPONSES = True
+
+    def __init__(self, review_aspects: Sequence[str] = ("technical correctness and efficiency", "code style and readability"), **kwargs):
+        self.review_aspects = tuple(review_aspects)
         super().__init__(
-            name=f"{review_aspect.replace(' ', '')}Reviewer",
-            instructions=formatted_instructions,
+            name="MultiAspectReviewer",
+            instructions=_multi_aspect_reviewer_instructions(self.review_aspects),
             **kwargs
         )
 
+    def parse_output(self, output: Optional[str]) -> Optional[List[str]]:
+        """
+        Extracts the per-aspect reviews from the agent's output.
+
+        Parameters
+        ----------
+        output : str or None
+            The agent's final output, optionally wrapped in a code fence.
+
+        Returns
+        -------
+        list of str or None
+            One review per aspect, in the order of `review_aspects`, or None
+            if the output is not a JSON object with a string for every aspect.
+        """
+        text = (output or "").strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+        try:
+            reviews = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(reviews, dict):
+            return None
+        if not all(isinstance(reviews.get(aspect), str) for aspect in self.review_aspects):
+            return None
+        return [reviews[aspect] for aspect in self.review_aspects]
+
 
 class CodeCommitterAgent(ReusableAgent):
     """An agent that commits file changes to a branch."""
+    TOOL_NAMES = ("commit_tree",)
+
     def __init__(self, **kwargs):
-        instructions = load_prompt("code_committer_agent.md")
-        super().__init__(
-            name="CodeCommitter",
-            instructions=instructions,
-            tools=[commit_files_to_branch, delete_file_from_branch],
-            **kwargs
-        )
+        instructions = _CODE_COMMITTER_INSTRUCTIONS
+        super().__init__(name="CodeCommitter", instructions=instructions, **kwargs)
 
 
 class BranchCreatorAgent(ReusableAgent):
     """An agent that creates a branch for a pull request."""
+    TOOL_NAMES = ("create_pr_branch",)
+
     def __init__(self, **kwargs):
-        instructions = load_prompt("branch_creator_agent.md")
-        super().__init__(
-            name="BranchCreator",
-            instructions=instructions,
-            tools=[create_pr_branch],
-            **kwargs
-        )
+        instructions = _BRANCH_CREATOR_INSTRUCTIONS
+        super().__init__(name="BranchCreator", instructions=instructions, **kwargs)
+
+
+class BranchAndCommitAgent(ReusableAgent):
+    """An agent that ensures the issue branch exists and commits file changes to it in one step."""
+    TOOL_NAMES = ("ensure_branch_and_commit",)
+
+    def __init__(self, **kwargs):
+        instructions = _BRANCH_AND_COMMIT_INSTRUCTIONS
+        super().__init__(name="BranchAndCommitter", instructions=instructions, **kwargs)
 
 
 class CommentPosterAgent(ReusableAgent):
     """An agent that posts comments to GitHub issues."""
+    TOOL_NAMES = ("post_comment_to_github",)
+
     def __init__(self, **kwargs):
-        instructions = load_prompt("comment_poster_agent.md")
-        super().__init__(name="CommentPoster", instructions=instructions, tools=[post_comment_to_github], **kwargs)
+        instructions = _COMMENT_POSTER_INSTRUCTIONS
+        super().__init__(name="CommentPoster", instructions=instructions, **kwargs)
+
+
+@functools.lru_cache(maxsize=32)
+def get_agent(agent_class: type, **kwargs) -> ReusableAgent:
+    """
+    Returns a shared instance of an agent class for the given arguments.
+
+    Agents hold no per-run state, so repeated workflow runs with the same
+    model can reuse one instance of each agent instead of constructing new
+    ones.
+
+    Parameters
+    ----------
+    agent_class : type
+        The ReusableAgent subclass to instantiate.
+    **kwargs
+        Hashable constructor arguments (e.g., model, review_aspect).
+
+    Returns
+    -------
+    ReusableAgent
+        The cached agent instance.
+    """
+    return agent_class(**kwargs)
+
+
+# The review aspects of the workflow's reviewers.
+TECHNICAL_REVIEW_ASPECT = "technical correctness and efficiency"
+STYLE_REVIEW_ASPECT = "code style and readability"
+
+
+@dataclass(frozen=True)
+class WorkflowAgents:
+    """
+    The agents used by one run of the issue-solving workflow.
+
+    Build it with `get_workflow_agents`, which constructs the agents once per
+    model and returns the same instance for every workflow run.
+    """
+    triager: IssueTriagerAgent
+    issue_analyzer: IssueAnalysisAgent
+    planner: PlannerAgent
+    file_identifier: FileIdentifierAgent
+    code_proposer: CodeProposerAgent
+    change_explainer: ChangeExplainerAgent
+    batch_change_explainer: BatchChangeExplainerAgent
+    technical_reviewer: CodeReviewerAgent
+    style_reviewer: CodeReviewerAgent
+    multi_aspect_reviewer: MultiAspectReviewerAgent
+    branch_and_committer: BranchAndCommitAgent
+    comment_poster: CommentPosterAgent
+
+
+@functools.lru_cache(maxsize=8)
+def get_workflow_agents(model: Optional[str] = None) -> WorkflowAgents:
+    """
+    Returns the shared set of workflow agents for a model.
+
+    Parameters
+    ----------
+    model : str, optional
+        The model the agents use. By default, the agents SDK's default model.
+
+    Returns
+    -------
+    WorkflowAgents
+        The cached agents.
+    """
+    model_kwargs = {"model": model} if model is not None else {}
+    return WorkflowAgents(
+        triager=get_agent(IssueTriagerAgent, **model_kwargs),
+        issue_analyzer=get_agent(IssueAnalysisAgent, **model_kwargs),
+        planner=get_agent(PlannerAgent, **model_kwargs),
+        file_identifier=get_agent(FileIdentifierAgent, **model_kwargs),
+        code_proposer=get_agent(CodeProposerAgent, **model_kwargs),
+        change_explainer=get_agent(ChangeExplainerAgent, **model_kwargs),
+        batch_change_explainer=get_agent(BatchChangeExplainerAgent, **model_kwargs),
+        technical_reviewer=get_agent(CodeReviewerAgent, review_aspect=TECHNICAL_REVIEW_ASPECT, **model_kwargs),
+        style_reviewer=get_agent(CodeReviewerAgent, review_aspect=STYLE_REVIEW_ASPECT, **model_kwargs),
+        multi_aspect_reviewer=get_agent(
+            MultiAspectReviewerAgent, review_aspects=(TECHNICAL_REVIEW_ASPECT, STYLE_REVIEW_ASPECT), **model_kwargs
+        ),
+        branch_and_committer=get_agent(BranchAndCommitAgent, **model_kwargs),
+        comment_poster=get_agent(CommentPosterAgent, **model_kwargs),
+    )
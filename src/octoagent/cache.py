@@ -0,0 +1,209 @@
+"""
+Response caches for agent runs.
+
+This module provides the LLMCache class, which stores agent outputs in memory
+keyed by a hash of everything that determines them (agent, model,
+instructions and input), so repeated runs on identical input can skip the LLM
+call, and the DiskCache class, which persists such outputs across processes
+(optionally backing the LLMCache).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Builds a stable cache key from the given parts.
+
+    Parameters
+    ----------
+    *parts : object
+        JSON-serializable values that determine the cached response
+        (e.g., agent name, model, instructions, input).
+
+    Returns
+    -------
+    str
+        The hex SHA-256 digest of the parts.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    A least-recently-used cache of LLM responses with a time-to-live.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        The maximum number of responses to keep, by default 256.
+    ttl : float, optional
+        Seconds after which a cached response expires, by default 3600.
+    enabled : bool, optional
+        Whether the cache is active. If not provided, it is enabled when the
+        `OCTOAGENT_LLM_CACHE` environment variable is set to a true value.
+    store : DiskCache, optional
+        A persistent store backing the cache. Text responses are written
+        through to it, and lookups that miss in memory fall back to it, so
+        responses survive process restarts. Stored entries expire after `ttl`
+        seconds as well, counted from when they were written.
+
+    Attributes
+    ----------
+    hits : int
+        The number of lookups served from the cache.
+    misses : int
+        The number of lookups that were not in the cache.
+    """
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0, enabled: Optional[bool] = None, store: Optional["DiskCache"] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        if enabled is None:
+            enabled = os.environ.get("OCTOAGENT_LLM_CACHE", "").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.store = store
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached response for `key`, or None on a miss."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            stored_value = self.store.get(key, ttl=self.ttl) if self.store is not None else None
+            if stored_value is not None:
+                self._remember(key, stored_value)
+                self.hits += 1
+                logger.debug(f"LLM cache hit on disk for key {key[:12]}...")
+                return stored_value
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.debug(f"LLM cache hit for key {key[:12]}...")
+        return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores a response, evicting the least recently used one if full."""
+        if not self.enabled:
+            return
+        self._remember(key, value)
+        # Only text can be persisted; run results and other objects stay in memory.
+        if self.store is not None and isinstance(value, str):
+            self.store.set(key, value)
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Stores a response in memory, evicting the least recently used one if full."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all cached responses."""
+        self._entries.clear()
+
+
+class DiskCache:
+    """
+    A persistent store of LLM responses backed by SQLite.
+
+    Parameters
+    ----------
+    path : str, optional
+        The database file. If not provided, `responses.sqlite` in the
+        directory named by the `OCTOAGENT_CACHE_DIR` environment variable,
+        or `~/.octoagent/cache`.
+
+    Notes
+    -----
+    The database is opened on first use. Each entry records when it was
+    written, so readers can pass a `ttl` to `get` to ignore old entries.
+    Entries are never deleted; delete the file to clear the cache.
+    """
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            cache_dir = os.environ.get("OCTOAGENT_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".octoagent", "cache")
+            path = os.path.join(cache_dir, "responses.sqlite")
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database, creating it if needed."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL DEFAULT 0)"
+            )
+            # Databases written before entries were timestamped lack the column; their
+            # entries count as written at the epoch.
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(responses)")}
+            if "created_at" not in columns:
+                with connection:
+                    connection.execute("ALTER TABLE responses ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[str]:
+        """
+        Returns the stored response for `key`, or None if there is none.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        ttl : float, optional
+            If provided, entries written more than `ttl` seconds ago are
+            treated as missing.
+
+        Returns
+        -------
+        str or None
+            The stored response, or None if there is no (fresh) entry.
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read the response cache at {self.path}: {e}")
+            return None
+        if row is None or (ttl is not None and time.time() - row[1] >= ttl):
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """Stores a response, replacing any previous one for `key`."""
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)", (key, value, time.time())
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write to the response cache at {self.path}: {e}")
+
+
+# Persistent store backing llm_cache when OCTOAGENT_LLM_CACHE_PERSIST is set.
+disk_cache = DiskCache()
+
+# Shared by all agents in the process.
+llm_cache = LLMCache(
+    store=disk_cache if os.environ.get("OCTOAGENT_LLM_CACHE_PERSIST", "").lower() in ("1", "true", "yes") else None
+)
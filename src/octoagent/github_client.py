@@ -9,12 +9,113 @@ import asyncio
 import base64
 import json
 import os
-import requests
-from typing import Any, Dict, Optional
+import random
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple, Union
 import logging
 
+import aiohttp
+
+try:
+    # orjson is optional; it decodes the large issue, tree and contents
+    # payloads several times faster than the standard library.
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
+
+# Only the issue fields the triage step reads; the REST payload has 100+.
+_ISSUE_FIELDS = """
+    number title body url state createdAt updatedAt
+    author { login }
+    labels(first: 20) { nodes { name } }
+    comments { totalCount }
+"""
+
+_ISSUE_QUERY = """
+query($owner: String!, $repo: String!, $number: Int!) {
+  repository(owner: $owner, name: $repo) {
+    issue(number: $number) {%s}
+  }
+  rateLimit { cost remaining resetAt }
+}
+""" % _ISSUE_FIELDS
+
+# The issue together with the repository's default branch and its head commit,
+# which the workflow otherwise fetches with three separate REST requests.
+_ISSUE_CONTEXT_QUERY = """
+query($owner: String!, $repo: String!, $number: Int!) {
+  repository(owner: $owner, name: $repo) {
+    defaultBranchRef { name target { ... on Commit { oid tree { oid } } } }
+    issue(number: $number) {%s}
+  }
+  rateLimit { cost remaining resetAt }
+}
+""" % _ISSUE_FIELDS
+
+
+def _flatten_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a GraphQL issue node onto the REST issue keys used downstream."""
+    return {
+        "number": issue.get("number"),
+        "title": issue.get("title"),
+        "body": issue.get("body"),
+        "html_url": issue.get("url"),
+        "state": (issue.get("state") or "").lower(),
+        "created_at": issue.get("createdAt"),
+        "updated_at": issue.get("updatedAt"),
+        "user": {"login": (issue.get("author") or {}).get("login")},
+        "labels": [{"name": label["name"]} for label in (issue.get("labels") or {}).get("nodes", []) if label],
+        "comments": (issue.get("comments") or {}).get("totalCount", 0),
+    }
+
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "PATCH", "DELETE"})
+_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def _backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Returns how long to wait before retrying a request.
+
+    Honors a `Retry-After` header when GitHub sends one; otherwise uses
+    exponential backoff capped at 32 seconds plus up to a second of jitter.
+    """
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return min(32, 2 ** attempt) + random.uniform(0, 1)
+
+
+def _body_excerpt(data: Any, text: Optional[str], limit: int = 100) -> str:
+    """
+    Returns the start of a response body for log and error messages.
+
+    Bodies are only re-serialized here, on error paths; successful responses
+    keep just the decoded JSON.
+    """
+    if text is None:
+        text = json.dumps(data)
+    return text[:limit]
+
+
+def _reason(status: int) -> str:
+    """Returns the standard reason phrase for an HTTP status code."""
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return "Unknown Status"
+
+
 class GitHubClient:
     """
     A client to handle interactions with the GitHub REST API.
@@ -35,7 +136,34 @@ class GitHubClient:
         The GitHub token used for authentication.
     headers : dict
         The headers to include in all API requests.
+
+    Notes
+    -----
+    All requests share a single pooled `aiohttp.ClientSession`, created lazily
+    on first use. Call `aclose()` (or use the client as an async context
+    manager) once the client is no longer needed.
     """
+    # Maximum number of issues fetched by a single GraphQL request.
+    ISSUE_BATCH_SIZE = 50
+    # Upper bound on the number of GET responses kept for conditional requests.
+    ETAG_CACHE_SIZE = 256
+    # Seconds a looked-up branch head is reused before it is fetched again.
+    BRANCH_HEAD_TTL = 30.0
+    # Seconds a fetched issue is reused before it is fetched again.
+    ISSUE_CACHE_TTL = 60.0
+    # Upper bound on the number of file contents and file trees kept per commit.
+    CONTENT_CACHE_SIZE = 256
+    # Number of times a transient failure (5xx, 429, secondary rate limit,
+    # network error) is retried before the error is returned.
+    MAX_RETRIES = 5
+    # Maximum number of requests in flight at once.
+    MAX_CONCURRENT_REQUESTS = 10
+    # Once fewer than this fraction of the window's requests (as reported by
+    # X-RateLimit-Limit) remain, new requests wait for the window to reset:
+    # 100 of the 5000 authenticated requests, and none of the 60 unauthenticated
+    # ones until they are all used up.
+    RATE_LIMIT_BUFFER_FRACTION = 0.02
+
     def __init__(self, token: Optional[str] = None, base_url: str = "https://api.github.com"):
         self.base_url = base_url
         self.token = token or os.environ.get("GITHUB_TOKEN")
@@ -47,8 +175,99 @@ class GitHubClient:
             self.headers["Authorization"] = f"token {self.token}"
         else:
             logger.warning("GitHubClient initialized without a GITHUB_TOKEN. Authenticated operations will fail.")
+        self._session: Optional[aiohttp.ClientSession] = None
+        # The event loop the session was opened on; sessions cannot be shared across loops.
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # (owner, repo, branch) -> (head commit SHA, head tree SHA) for branches
+        # this client created or committed to, so commits skip the ref lookup.
+        self._branch_heads: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+        # (owner, repo, branch) -> (time.monotonic() of the lookup, (commit SHA, tree SHA))
+        # for recent branch-head lookups, reused for `BRANCH_HEAD_TTL` seconds.
+        self._sha_cache: Dict[Tuple[str, str, str], Tuple[float, Tuple[str, str]]] = {}
+        # (owner, repo, issue number) -> (time.monotonic() of the fetch, issue details)
+        # for recently fetched issues, reused for `ISSUE_CACHE_TTL` seconds.
+        self._issue_cache: Dict[Tuple[str, str, int], Tuple[float, Dict[str, Any]]] = {}
+        # (owner, repo, commit SHA, path) -> file content result, and (owner, repo, commit or
+        # tree SHA) -> (path, mode) of each file. A commit never changes, so these entries
+        # never go stale.
+        self._content_cache: "OrderedDict[Tuple[str, str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._tree_cache: "OrderedDict[Tuple[str, str, str], Tuple[Tuple[str, str], ...]]" = OrderedDict()
+        # url -> (ETag, decoded JSON, body text or None) of the last 200 response to a GET.
+        self._etag_cache: "OrderedDict[str, Tuple[str, Any, Optional[str]]]" = OrderedDict()
+        # Rate-limit resource ('core', 'graphql', ...) -> (remaining, limit, reset epoch
+        # seconds), as last reported by the X-RateLimit-* response headers.
+        self._rate_limits: Dict[str, Tuple[int, int, float]] = {}
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "GitHubClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the shared HTTP session, creating it on first use.
+
+        The session keeps a pool of keep-alive connections to the API host, so
+        repeated calls skip the TCP and TLS handshakes. A new session is opened
+        when the client is used from a different event loop (e.g., a second
+        `asyncio.run` call), since a session is bound to the loop it was
+        created on.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is not loop:
+            if self._session_loop is not None and not self._session_loop.is_closed():
+                logger.warning("GitHubClient used from a new event loop; opening a new HTTP session.")
+            self._session = None
+            self._request_semaphore = None
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+            self._session_loop = loop
+        if self._request_semaphore is None:
+            self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        return self._session
+
+    def _rate_limit_buffer(self, limit: int) -> int:
+        """Returns how many requests of a window of `limit` are held back; at least 1."""
+        return max(1, int(limit * self.RATE_LIMIT_BUFFER_FRACTION))
+
+    async def _wait_for_rate_limit(self, resource: str) -> None:
+        """Sleeps until the rate-limit window resets if it is nearly used up."""
+        remaining, limit, reset_at = self._rate_limits.get(resource, (None, 0, 0.0))
+        if remaining is None or remaining >= self._rate_limit_buffer(limit):
+            return
+        delay = reset_at - time.time()
+        if delay > 0:
+            logger.warning(f"GitHub '{resource}' rate limit nearly exhausted ({remaining} left); waiting {delay:.0f}s for reset.")
+            await asyncio.sleep(delay)
+        self._rate_limits.pop(resource, None)
+
+    def _record_rate_limit(self, headers: Any) -> None:
+        """Updates the rate-limit tracker from a response's X-RateLimit-* headers."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+        try:
+            self._rate_limits[resource] = (
+                int(remaining), int(headers.get("X-RateLimit-Limit", 0)), float(headers.get("X-RateLimit-Reset", 0))
+            )
+        except ValueError:
+            pass
+
+    async def aclose(self) -> None:
+        """Closes the shared HTTP session, if one was opened."""
+        if self._session is not None and not self._session.closed and self._session_loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Tuple[int, Any, Optional[str]]:
         """
         A private helper method to make a request to the GitHub API.
 
@@ -59,28 +278,147 @@ class GitHubClient:
         endpoint : str
             The API endpoint to target (e.g., '/repos/owner/repo').
         **kwargs : dict
-            Additional keyword arguments to pass to `requests.request`.
+            Additional keyword arguments to pass to `aiohttp.ClientSession.request`.
 
         Returns
         -------
-        requests.Response
-            The response object from the API request. Returns a mock response
-            in case of a network error.
+        tuple of (int, object, str or None)
+            The HTTP status code, the decoded JSON body (None if the body is
+            not JSON) and the body text. The text is only decoded when the
+            body is not JSON, and is None otherwise. A network error is
+            reported as a 503 status with an error payload.
+
+        Notes
+        -----
+        GET responses carrying an ETag are remembered, and repeated GETs to the
+        same URL are sent as conditional requests. A `304 Not Modified` reply
+        does not count against the primary rate limit and is returned to the
+        caller as the cached 200 response.
+
+        Transient failures (5xx, 429, secondary rate limits, network errors)
+        are retried up to `MAX_RETRIES` times with exponential backoff and
+        jitter, honoring `Retry-After`. Non-idempotent writes are only
+        retried when the request was rejected before taking effect.
+
+        At most `MAX_CONCURRENT_REQUESTS` requests are in flight at once, and
+        the remaining quota reported in the `X-RateLimit-*` headers is tracked
+        per resource (REST 'core' and 'graphql' separately). When it drops
+        below `RATE_LIMIT_BUFFER_FRACTION` of the window's limit (or to zero
+        for small limits), requests wait for the window to reset instead of
+        running into 403 responses.
         """
         url = f"{self.base_url}{endpoint}"
-        try:
-            response = requests.request(method, url, headers=self.headers, **kwargs)
-            return response
-        except requests.exceptions.RequestException as e:
-            logger.error(f"GitHub API RequestException for {method} {url}: {e}")
-            mock_response = requests.Response()
-            mock_response.status_code = 503
-            mock_response.reason = "Network Error"
+        cached = self._etag_cache.get(url) if method == "GET" else None
+        if cached:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": cached[0]}
+        if "json" in kwargs:
+            # Serialize the payload ourselves so the faster codec is used for it too.
+            kwargs["data"] = _json_dumps(kwargs.pop("json"))
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
+        # Writes are only retried after server errors when repeating them is harmless:
+        # GraphQL queries and Git Data API objects are, a new issue comment is not.
+        idempotent = method in _IDEMPOTENT_METHODS or endpoint == "/graphql" or "/git/" in endpoint
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self._wait_for_rate_limit("graphql" if endpoint == "/graphql" else "core")
             try:
-                mock_response.json = lambda: {"error": str(e), "message": "Network request to GitHub failed."}
-            except: # pylint: disable=bare-except
-                mock_response._content = b'{"error": "Network request to GitHub failed."}' # type: ignore
-            return mock_response
+                session = await self._get_session()
+                async with self._request_semaphore, session.request(method, url, **kwargs) as response:
+                    self._record_rate_limit(response.headers)
+                    if cached and response.status == 304:
+                        logger.debug(f"GitHub API: {url} not modified; using cached response.")
+                        self._etag_cache.move_to_end(url)
+                        return 200, cached[1], cached[2]
+                    status = response.status
+                    # Parse JSON straight from the raw bytes; the body is only
+                    # decoded to a string when it turns out not to be JSON.
+                    raw = await response.read()
+                    data, text = None, None
+                    if raw:
+                        try:
+                            data = _json_loads(raw)
+                        except ValueError:
+                            text = raw.decode(response.get_encoding(), errors="replace")
+                    else:
+                        text = ""
+                    retry_after = response.headers.get("Retry-After")
+                    throttled = status == 429 or (status == 403 and (
+                        retry_after is not None
+                        or response.headers.get("X-RateLimit-Remaining") == "0"
+                        or "secondary rate limit" in _body_excerpt(data, text, len(raw)).lower()
+                    ))
+                    etag = response.headers.get("ETag")
+                    if method == "GET" and status == 200 and etag:
+                        self._etag_cache[url] = (etag, data, text)
+                        self._etag_cache.move_to_end(url)
+                        if len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+                            self._etag_cache.popitem(last=False)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # A connection that was never established cannot have had side effects.
+                if (idempotent or isinstance(e, aiohttp.ClientConnectorError)) and attempt < self.MAX_RETRIES:
+                    delay = _backoff_delay(attempt)
+                    logger.warning(f"GitHub API request error for {method} {url}: {e!r}; retrying in {delay:.1f}s ({attempt + 1}/{self.MAX_RETRIES}).")
+                    await asyncio.sleep(delay)
+                    continue
+                logger.error(f"GitHub API request error for {method} {url}: {e!r}")
+                return 503, {"error": repr(e), "message": "Network request to GitHub failed."}, ""
+
+            if (throttled or (idempotent and status in _RETRY_STATUSES)) and attempt < self.MAX_RETRIES:
+                delay = _backoff_delay(attempt, retry_after)
+                logger.warning(f"GitHub API returned {status} for {method} {url}; retrying in {delay:.1f}s ({attempt + 1}/{self.MAX_RETRIES}).")
+                await asyncio.sleep(delay)
+                continue
+            return status, data, text
+        return status, data, text
+
+    @staticmethod
+    def _error_payload(status: int, data: Any, text: Optional[str], prefix: str = "HTTPError") -> Dict[str, Any]:
+        """Builds the error dictionary returned to callers for a failed request."""
+        error_payload: Dict[str, Any] = {"error": f"{prefix}: {status} {_reason(status)}",
+                                         "details_text": _body_excerpt(data, text, 500)}
+        if data is not None:
+            error_payload["details_json"] = data
+        return error_payload
+
+    async def _graphql(self, query: str, variables: Optional[Dict[str, Any]] = None, partial: bool = False) -> Dict[str, Any]:
+        """
+        Runs a query against the GitHub GraphQL API.
+
+        Parameters
+        ----------
+        query : str
+            The GraphQL query document.
+        variables : dict, optional
+            The query variables.
+        partial : bool, optional
+            Whether to keep the `data` of a response that also reports errors,
+            by default False. GitHub answers with partial data when only some
+            fields fail (e.g., one of several aliased issues does not exist).
+            The errors are then returned under the '_errors' key next to the
+            data, for the caller to match by their `path`.
+
+        Returns
+        -------
+        dict
+            The `data` object of the response, or an error payload.
+        """
+        payload = {"query": query, "variables": variables or {}}
+        status, body, text = await self._make_request("POST", "/graphql", json=payload)
+        if status >= 400 or not isinstance(body, dict):
+            logger.error(f"HTTPError running GraphQL query: {status} {_reason(status)} - {_body_excerpt(body, text)}")
+            return self._error_payload(status, body if isinstance(body, dict) else None, text)
+        if body.get("errors"):
+            messages = "; ".join(err.get("message", "") for err in body["errors"])
+            if partial and body.get("data"):
+                logger.warning(f"GraphQL query partially failed: {messages}")
+                return {**body["data"], "_errors": body["errors"]}
+            logger.error(f"GraphQL query failed: {messages}")
+            return {"error": f"GraphQL error: {messages}", "details_json": body}
+        data = body.get("data") or {}
+        rate_limit = data.get("rateLimit")
+        if rate_limit:
+            logger.debug(f"GraphQL rate limit: cost={rate_limit.get('cost')}, remaining={rate_limit.get('remaining')}, resets at {rate_limit.get('resetAt')}")
+        return data
 
     async def get_default_branch(self, owner: str, repo: str) -> Optional[str]:
         """
@@ -99,14 +437,11 @@ class GitHubClient:
             The name of the default branch, or None if an error occurs.
         """
         endpoint = f"/repos/{owner}/{repo}"
-        try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("GET", endpoint))
-            response.raise_for_status()
-            return response.json().get("default_branch")
-        except Exception as e:
-            logger.error(f"Error getting default branch for {owner}/{repo}: {e}")
+        status, data, text = await self._make_request("GET", endpoint)
+        if status != 200 or not isinstance(data, dict):
+            logger.error(f"Error getting default branch for {owner}/{repo}: {status} {_reason(status)} - {_body_excerpt(data, text)}")
             return None
+        return data.get("default_branch")
 
     async def get_issue_details(self, owner: str, repo: str, issue_number: int) -> Dict[str, Any]:
         """
@@ -125,22 +460,193 @@ class GitHubClient:
         -------
         dict
             A dictionary containing the issue details, or an error payload.
+
+        Notes
+        -----
+        With a token, the issue is fetched with a single GraphQL query that
+        selects only the fields the workflow reads, flattened to the REST key
+        names. GraphQL requires authentication, so without a token the REST
+        endpoint is used instead. Issues fetched in the last `ISSUE_CACHE_TTL`
+        seconds (including by `get_issue_context`) are served from memory.
         """
+        key = (owner, repo, issue_number)
+        cached = self._issue_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.ISSUE_CACHE_TTL:
+            return cached[1]
+
+        if self.token:
+            data = await self._graphql(_ISSUE_QUERY, {"owner": owner, "repo": repo, "number": issue_number})
+            if "error" in data:
+                return data
+            issue = (data.get("repository") or {}).get("issue")
+            if not issue:
+                logger.error(f"Issue {owner}/{repo}#{issue_number} not found.")
+                return {"error": f"Issue {owner}/{repo}#{issue_number} not found.", "status": "not_found"}
+            issue_details = _flatten_issue(issue)
+            self._issue_cache[key] = (time.monotonic(), issue_details)
+            return issue_details
+
         endpoint = f"/repos/{owner}/{repo}/issues/{issue_number}"
-        try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("GET", endpoint))
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTPError getting issue details for {owner}/{repo}#{issue_number}: {e.response.status_code} {e.response.reason} - {e.response.text[:100]}")
-            error_payload = {"error": f"HTTPError: {e.response.status_code} {e.response.reason}", "details_text": e.response.text}
-            try: error_payload["details_json"] = e.response.json()
-            except ValueError: pass
-            return error_payload
-        except Exception as e:
-            logger.error(f"Failed to get issue details for {owner}/{repo}#{issue_number}: {str(e)}")
-            return {"error": f"Failed to get issue details for {owner}/{repo}#{issue_number}: {str(e)}"}
+        status, data, text = await self._make_request("GET", endpoint)
+        if status >= 400:
+            logger.error(f"HTTPError getting issue details for {owner}/{repo}#{issue_number}: {status} {_reason(status)} - {_body_excerpt(data, text)}")
+            return self._error_payload(status, data, text)
+        if not isinstance(data, dict):
+            logger.error(f"Failed to get issue details for {owner}/{repo}#{issue_number}: unexpected response body.")
+            return {"error": f"Failed to get issue details for {owner}/{repo}#{issue_number}: unexpected response body."}
+        self._issue_cache[key] = (time.monotonic(), data)
+        return data
+
+    async def get_issue_context(self, owner: str, repo: str, issue_number: int) -> Dict[str, Any]:
+        """
+        Retrieves an issue together with the repository's default branch.
+
+        Parameters
+        ----------
+        owner : str
+            The owner of the repository.
+        repo : str
+            The name of the repository.
+        issue_number : int
+            The number of the issue to retrieve.
+
+        Returns
+        -------
+        dict
+            A dictionary with the keys 'issue' (the issue details, as returned
+            by `get_issue_details`, or an error payload, whose 'status' is
+            'not_found' if the issue does not exist) and 'default_branch' (the
+            default branch name, or None if it could not be determined).
+
+        Notes
+        -----
+        With a token, both come from one GraphQL query that also returns the
+        default branch's head commit. The issue and the branch head are cached,
+        so the issue download and file listing that follow in the workflow are
+        served without another request for the issue or the branch. If the
+        query cannot return the default branch (e.g., the token has no
+        GraphQL access), it is looked up through REST instead. Without a
+        token, the two REST requests are made concurrently.
+        """
+        if not self.token:
+            default_branch, issue = await asyncio.gather(
+                self.get_default_branch(owner, repo),
+                self.get_issue_details(owner, repo, issue_number),
+            )
+            return {"issue": issue, "default_branch": default_branch}
+
+        # Partial data keeps the default branch when only the issue is missing.
+        data = await self._graphql(_ISSUE_CONTEXT_QUERY, {"owner": owner, "repo": repo, "number": issue_number}, partial=True)
+        if "error" in data:
+            return {"issue": data, "default_branch": await self.get_default_branch(owner, repo)}
+        repository = data.get("repository") or {}
+        now = time.monotonic()
+        default_branch_ref = repository.get("defaultBranchRef") or {}
+        default_branch = default_branch_ref.get("name")
+        head = default_branch_ref.get("target") or {}
+        if default_branch and head.get("oid"):
+            self._sha_cache[(owner, repo, default_branch)] = (now, (head["oid"], (head.get("tree") or {}).get("oid")))
+        if not default_branch:
+            default_branch = await self.get_default_branch(owner, repo)
+        issue = repository.get("issue")
+        if not issue:
+            logger.error(f"Issue {owner}/{repo}#{issue_number} not found.")
+            return {
+                "issue": {"error": f"Issue {owner}/{repo}#{issue_number} not found.", "status": "not_found"},
+                "default_branch": default_branch,
+            }
+        issue_details = _flatten_issue(issue)
+        self._issue_cache[(owner, repo, issue_number)] = (now, issue_details)
+        return {"issue": issue_details, "default_branch": default_branch}
+
+    async def get_issues_batch(self, refs: List[Tuple[str, str, int]]) -> List[Dict[str, Any]]:
+        """
+        Retrieves the details for several issues, possibly across repositories.
+
+        Parameters
+        ----------
+        refs : list of tuple of (str, str, int)
+            The (owner, repo, issue_number) of each issue to retrieve.
+
+        Returns
+        -------
+        list of dict
+            The issue details (same keys as `get_issue_details`) or an error
+            payload for each entry of `refs`, in the same order.
+
+        Notes
+        -----
+        With a token, up to `ISSUE_BATCH_SIZE` issues are fetched per GraphQL
+        request using one aliased `repository { issue }` selection each, instead
+        of one request per issue. An issue or repository that cannot be read
+        only fails its own entry. Without a token, the issues are fetched
+        concurrently through the REST endpoint. Either way, fetched issues are
+        cached like those of `get_issue_details`.
+        """
+        if not self.token:
+            return list(await asyncio.gather(*(self.get_issue_details(o, r, n) for o, r, n in refs)))
+
+        results: List[Dict[str, Any]] = []
+        for offset in range(0, len(refs), self.ISSUE_BATCH_SIZE):
+            chunk = refs[offset:offset + self.ISSUE_BATCH_SIZE]
+            params, selections, variables = [], [], {}
+            for i, (owner, repo, number) in enumerate(chunk):
+                params.append(f"$o{i}: String!, $r{i}: String!, $n{i}: Int!")
+                selections.append(f"i{i}: repository(owner: $o{i}, name: $r{i}) {{ issue(number: $n{i}) {{{_ISSUE_FIELDS}}} }}")
+                variables.update({f"o{i}": owner, f"r{i}": repo, f"n{i}": number})
+            query = "query(%s) {\n%s\nrateLimit { cost remaining resetAt }\n}" % (", ".join(params), "\n".join(selections))
+            data = await self._graphql(query, variables, partial=True)
+            # Alias -> errors reported for fields under it.
+            alias_errors: Dict[str, List[Dict[str, Any]]] = {}
+            for err in data.get("_errors", []):
+                if err.get("path"):
+                    alias_errors.setdefault(str(err["path"][0]), []).append(err)
+            for i, (owner, repo, number) in enumerate(chunk):
+                if "error" in data:
+                    results.append(data)
+                    continue
+                issue = (data.get(f"i{i}") or {}).get("issue")
+                errors = alias_errors.get(f"i{i}", [])
+                if issue:
+                    issue_details = _flatten_issue(issue)
+                    self._issue_cache[(owner, repo, number)] = (time.monotonic(), issue_details)
+                    results.append(issue_details)
+                elif not errors or all(err.get("type") == "NOT_FOUND" for err in errors):
+                    results.append({"error": f"Issue {owner}/{repo}#{number} not found.", "status": "not_found"})
+                else:
+                    messages = "; ".join(err.get("message", "") for err in errors)
+                    results.append({"error": f"Could not fetch issue {owner}/{repo}#{number}: {messages}"})
+        return results
+
+    async def _get_branch_head(self, owner: str, repo: str, branch: str) -> Optional[Tuple[str, str]]:
+        """
+        Gets the head commit SHA and its tree SHA for a branch.
+
+        Lookups are cached for `BRANCH_HEAD_TTL` seconds, so repeated branch
+        creations from the same base within one run cost a single request.
+
+        Returns
+        -------
+        tuple of (str, str) or None
+            The commit SHA and tree SHA, or None if an error occurs.
+        """
+        key = (owner, repo, branch)
+        cached = self._sha_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.BRANCH_HEAD_TTL:
+            return cached[1]
+
+        endpoint = f"/repos/{owner}/{repo}/branches/{branch}"
+        status, data, text = await self._make_request("GET", endpoint)
+        if status != 200 or not isinstance(data, dict):
+            logger.error(f"Error getting latest commit SHA for {owner}/{repo}/{branch}: {status} {_reason(status)} - {_body_excerpt(data, text)}")
+            return None
+        commit = data.get("commit", {})
+        commit_sha = commit.get("sha")
+        tree_sha = commit.get("commit", {}).get("tree", {}).get("sha")
+        if not commit_sha:
+            return None
+        self._sha_cache[key] = (time.monotonic(), (commit_sha, tree_sha))
+        return commit_sha, tree_sha
 
     async def get_latest_commit_sha(self, owner: str, repo: str, branch: str) -> Optional[str]:
         """
@@ -160,15 +666,8 @@ class GitHubClient:
         str or None
             The SHA of the latest commit, or None if an error occurs.
         """
-        endpoint = f"/repos/{owner}/{repo}/branches/{branch}"
-        try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("GET", endpoint))
-            response.raise_for_status()
-            return response.json().get("commit", {}).get("sha")
-        except Exception as e:
-            logger.error(f"Error getting latest commit SHA for {owner}/{repo}/{branch}: {e}")
-            return None
+        head = await self._get_branch_head(owner, repo, branch)
+        return head[0] if head else None
 
     async def create_branch(self, owner: str, repo: str, new_branch_name: str, base_branch_name: str) -> Dict[str, Any]:
         """
@@ -178,28 +677,24 @@ class GitHubClient:
             logger.error("GitHub token is required to create a branch.")
             return {"error": "GitHub token is required to create a branch."}
 
-        latest_sha = await self.get_latest_commit_sha(owner, repo, base_branch_name)
+        base_head = await self._get_branch_head(owner, repo, base_branch_name)
+        latest_sha = base_head[0] if base_head else None
         if not latest_sha:
             logger.error(f"Could not get SHA for base branch '{base_branch_name}' in {owner}/{repo}.")
             return {"error": f"Could not get SHA for base branch '{base_branch_name}' in {owner}/{repo}."}
 
         endpoint = f"/repos/{owner}/{repo}/git/refs"
         payload = {"ref": f"refs/heads/{new_branch_name}", "sha": latest_sha}
-        
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(None, lambda: self._make_request("POST", endpoint, json=payload))
-
-        response_data = {}
-        try:
-            response_data = response.json()
-        except (json.JSONDecodeError, ValueError):
-            response_data = {"text_response": response.text}
+        status, data, text = await self._make_request("POST", endpoint, json=payload)
+        response_data = data if data is not None else {"text_response": text}
 
-        if response.status_code == 201:
+        if status == 201:
             logger.info(f"Branch '{new_branch_name}' created successfully in {owner}/{repo}.")
+            if base_head[1]:
+                self._branch_heads[(owner, repo, new_branch_name)] = base_head
             return response_data
-        elif response.status_code == 422:
-            message_from_response = response_data.get("message", "") if isinstance(response_data, dict) else response.text
+        elif status == 422:
+            message_from_response = response_data.get("message", "") if isinstance(response_data, dict) else text
             errors_from_response = response_data.get("errors", []) if isinstance(response_data, dict) else []
 
             if "Reference already exists" in message_from_response or \
@@ -210,19 +705,11 @@ class GitHubClient:
             else:
                 logger.error(f"422 Unprocessable Entity creating branch {new_branch_name}: {message_from_response}")
                 return {"error": f"422 Unprocessable Entity: {message_from_response}",
-                        "details_json": response_data if isinstance(response_data, dict) else {"text_response": response.text}}
-        else:
-            try:
-                response.raise_for_status()
-                return response_data
-            except requests.exceptions.HTTPError as e_http:
-                 logger.error(f"HTTPError creating branch {new_branch_name}: {e_http.response.status_code} {e_http.response.reason} - {e_http.response.text[:100]}")
-                 error_payload = {"error": f"HTTPError: {e_http.response.status_code} {e_http.response.reason}", "details_text": e_http.response.text}
-                 if isinstance(response_data, dict): error_payload["details_json"] = response_data
-                 return error_payload
-            except Exception as e_generic:
-                 logger.error(f"Unexpected error after branch creation attempt for {new_branch_name}: {e_generic}")
-                 return {"error": f"An unexpected error occurred after branch creation attempt: {str(e_generic)}"}
+                        "details_json": response_data if isinstance(response_data, dict) else {"text_response": text}}
+        elif status >= 400:
+            logger.error(f"HTTPError creating branch {new_branch_name}: {status} {_reason(status)} - {_body_excerpt(data, text)}")
+            return self._error_payload(status, data if isinstance(data, dict) else None, text)
+        return response_data
 
     async def add_comment_to_issue(self, owner: str, repo: str, issue_number: int, comment_body: str) -> Dict[str, Any]:
         """
@@ -233,54 +720,103 @@ class GitHubClient:
             return {"error": "GitHub token is required to post a comment."}
         endpoint = f"/repos/{owner}/{repo}/issues/{issue_number}/comments"
         payload = {"body": comment_body}
-        try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("POST", endpoint, json=payload))
-            response.raise_for_status()
-            logger.info(f"Comment posted successfully to {owner}/{repo}#{issue_number}.")
-            return response.json()
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTPError posting comment to {owner}/{repo}#{issue_number}: {e.response.status_code} {e.response.reason} - {e.response.text[:100]}")
-            error_payload = {"error": f"HTTPError: {e.response.status_code} {e.response.reason}", "details_text": e.response.text}
-            try: error_payload["details_json"] = e.response.json()
-            except ValueError: pass
-            return error_payload
-        except Exception as e:
-            logger.error(f"Failed to post comment to {owner}/{repo}#{issue_number}: {str(e)}")
-            return {"error": f"Failed to post comment: {str(e)}"}
+        status, data, text = await self._make_request("POST", endpoint, json=payload)
+        if status >= 400:
+            logger.error(f"HTTPError posting comment to {owner}/{repo}#{issue_number}: {status} {_reason(status)} - {_body_excerpt(data, text)}")
+            return self._error_payload(status, data, text)
+        logger.info(f"Comment posted successfully to {owner}/{repo}#{issue_number}.")
+        return data if isinstance(data, dict) else {"text_response": text}
 
     async def get_file_sha(self, owner: str, repo: str, file_path: str, branch_name: str) -> Optional[str]:
         """
         Gets the SHA of an existing file on a branch.
         """
         endpoint = f"/repos/{owner}/{repo}/contents/{file_path}?ref={branch_name}"
-        try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("GET", endpoint))
-            if response.status_code == 200:
-                return response.json().get("sha")
-            elif response.status_code == 404:
-                logger.debug(f"File {file_path} not found on branch {branch_name} in {owner}/{repo} during SHA lookup.")
-                return None 
-            response.raise_for_status()
-            return None # Should not be reached if raise_for_status works
-        except Exception as e:
-            logger.error(f"Error getting file SHA for {owner}/{repo}/{file_path} on branch {branch_name}: {e}")
+        status, data, text = await self._make_request("GET", endpoint)
+        if status == 200 and isinstance(data, dict):
+            return data.get("sha")
+        elif status == 404:
+            logger.debug(f"File {file_path} not found on branch {branch_name} in {owner}/{repo} during SHA lookup.")
             return None
+        logger.error(f"Error getting file SHA for {owner}/{repo}/{file_path} on branch {branch_name}: {status} {_reason(status)} - {_body_excerpt(data, text)}")
+        return None
+
+    def _remember(self, cache: "OrderedDict[Any, Any]", key: Any, value: Any) -> None:
+        """Stores an entry in one of the per-commit caches, evicting the oldest if full."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.CONTENT_CACHE_SIZE:
+            cache.popitem(last=False)
 
     async def get_file_content_from_repo(self, owner: str, repo: str, file_path: str, branch: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves the content of a specific file from a repository.
+
+        The branch is resolved to its head commit (a cached lookup), and the
+        decoded result is cached by commit SHA and path, so re-reading a file
+        that has not changed costs no further request.
+        """
+        head = await self._get_branch_head(owner, repo, branch)
+        return await self._get_file_content_at(owner, repo, file_path, head[0] if head else None, branch)
+
+    async def get_files_content_from_repo(self, owner: str, repo: str, file_paths: List[str], branch: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieves the content of several files from a repository concurrently.
+
+        Parameters
+        ----------
+        owner : str
+            The owner of the repository.
+        repo : str
+            The name of the repository.
+        file_paths : list of str
+            The paths of the files to retrieve.
+        branch : str
+            The branch to read the files from.
+
+        Returns
+        -------
+        dict
+            Maps each path to the result `get_file_content_from_repo` would
+            return for it.
+
+        Notes
+        -----
+        The branch is resolved to its head commit once for all files, then
+        the files are fetched concurrently (bounded by the client's request
+        limit) instead of one after another.
         """
-        endpoint = f"/repos/{owner}/{repo}/contents/{file_path}?ref={branch}"
-        logger.debug(f"GitHubClient: Fetching content for {owner}/{repo}/{file_path} on branch {branch}")
+        head = await self._get_branch_head(owner, repo, branch)
+        commit_sha = head[0] if head else None
+        results = await asyncio.gather(*(
+            self._get_file_content_at(owner, repo, file_path, commit_sha, branch) for file_path in file_paths
+        ))
+        return dict(zip(file_paths, results))
+
+    async def _get_file_content_at(self, owner: str, repo: str, file_path: str, commit_sha: Optional[str], branch: str) -> Dict[str, Any]:
+        """Gets a file at a commit through the content cache, or at the branch if the commit is unknown."""
+        content_key = (owner, repo, commit_sha, file_path) if commit_sha else None
+        if content_key in self._content_cache:
+            self._content_cache.move_to_end(content_key)
+            return self._content_cache[content_key]
+        result = await self._fetch_file_content(owner, repo, file_path, commit_sha or branch)
+        if content_key is not None and result.get("status") in ("success", "not_found"):
+            self._remember(self._content_cache, content_key, result)
+        return result
+
+    async def _fetch_file_content(self, owner: str, repo: str, file_path: str, ref: str) -> Dict[str, Any]:
+        """Fetches and decodes a file at a branch name or commit SHA."""
+        endpoint = f"/repos/{owner}/{repo}/contents/{file_path}?ref={ref}"
+        logger.debug(f"GitHubClient: Fetching content for {owner}/{repo}/{file_path} at {ref}")
+        status, response_json, text = await self._make_request("GET", endpoint)
+        if status >= 400:
+            logger.error(f"HTTPError fetching file {file_path}: {status} {_reason(status)} - {_body_excerpt(response_json, text)}")
+            if status == 404:
+                return {"error": f"File not found: {file_path}", "status": "not_found"}
+            return {"error": f"HTTPError fetching file: {status} {_reason(status)}", "details_text": _body_excerpt(response_json, text, 500), "status": "http_error"}
+
         try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("GET", endpoint))
-            response.raise_for_status() 
-            
-            response_json = response.json()
-            if isinstance(response_json, list): 
+            if isinstance(response_json, list):
                 logger.warning(f"Path '{file_path}' on {owner}/{repo} is a directory, not a file.")
                 return {"error": "Path is a directory, not a file.", "status": "is_directory"}
 
@@ -297,22 +833,108 @@ class GitHubClient:
                     "sha": response_json.get("sha"),
                     "status": "success"
                 }
-            else: 
+            else:
                 logger.warning(f"File content for '{file_path}' on {owner}/{repo} is empty or not available.")
                 return {"error": "File content is empty or not available.", "status": "empty_content", "sha": response_json.get("sha")}
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTPError fetching file {file_path}: {e.response.status_code} {e.response.reason} - {e.response.text[:100]}")
-            if e.response.status_code == 404:
-                return {"error": f"File not found: {file_path}", "status": "not_found"}
-            return {"error": f"HTTPError fetching file: {e.response.status_code} {e.response.reason}", "details_text": e.response.text, "status": "http_error"}
         except Exception as e:
             logger.error(f"Unexpected error fetching content for {file_path}: {e}")
             return {"error": f"Unexpected error fetching file content: {str(e)}", "status": "unknown_error"}
 
 
-    async def create_commit_on_branch(self, owner: str, repo: str, branch_name: str, commit_message: str, file_path: str, file_content: str) -> Dict[str, Any]:
+    async def _commit_tree(self, owner: str, repo: str, branch_name: str, commit_message: str, tree_entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Commits a set of tree entries on top of a branch head with the Git Data API.
+
+        Creates a tree based on the current head tree, a commit whose parent is
+        the current head, and then fast-forwards the branch ref to it. If the
+        cached head turns out to be stale, the head is re-read once and the
+        commit retried.
+
+        Parameters
+        ----------
+        owner : str
+            The owner of the repository.
+        repo : str
+            The name of the repository.
+        branch_name : str
+            The branch to commit to.
+        commit_message : str
+            The commit message.
+        tree_entries : list of dict
+            Entries for `POST /git/trees` (path, mode, type and sha). An entry
+            whose mode is None keeps the mode of the existing file at its path
+            (e.g., '100755' for an executable or '120000' for a symlink), or
+            gets '100644' if the path is new.
+
+        Returns
+        -------
+        dict
+            The new commit details, or an error payload.
+        """
+        key = (owner, repo, branch_name)
+        for attempt in range(2):
+            head = self._branch_heads.get(key)
+            if head is None:
+                head = await self._get_branch_head(owner, repo, branch_name)
+                if not head or not head[1]:
+                    logger.error(f"Could not resolve head of branch '{branch_name}' in {owner}/{repo}.")
+                    return {"error": f"Could not resolve head of branch '{branch_name}' in {owner}/{repo}."}
+            head_sha, head_tree_sha = head
+
+            entries = tree_entries
+            if any(entry.get("mode") is None for entry in tree_entries):
+                tree_files = await self._get_tree_files(owner, repo, head_tree_sha)
+                if "error" in tree_files:
+                    return tree_files
+                file_modes = dict(tree_files["files"])
+                entries = [
+                    {**entry, "mode": file_modes.get(entry["path"], "100644")} if entry.get("mode") is None else entry
+                    for entry in tree_entries
+                ]
+
+            status, tree_json, text = await self._make_request(
+                "POST", f"/repos/{owner}/{repo}/git/trees", json={"base_tree": head_tree_sha, "tree": entries}
+            )
+            if status >= 400 or not isinstance(tree_json, dict):
+                logger.error(f"HTTPError creating tree on {branch_name}: {status} {_reason(status)} - {_body_excerpt(tree_json, text)}")
+                return self._error_payload(status, tree_json, text)
+
+            status, commit_json, text = await self._make_request(
+                "POST", f"/repos/{owner}/{repo}/git/commits",
+                json={"message": commit_message, "tree": tree_json["sha"], "parents": [head_sha]}
+            )
+            if status >= 400 or not isinstance(commit_json, dict):
+                logger.error(f"HTTPError creating commit on {branch_name}: {status} {_reason(status)} - {_body_excerpt(commit_json, text)}")
+                return self._error_payload(status, commit_json, text)
+
+            status, ref_json, text = await self._make_request(
+                "PATCH", f"/repos/{owner}/{repo}/git/refs/heads/{branch_name}", json={"sha": commit_json["sha"]}
+            )
+            if status == 422 and attempt == 0:
+                logger.debug(f"  Head of '{branch_name}' moved since it was cached; retrying on the fresh head.")
+                self._branch_heads.pop(key, None)
+                self._sha_cache.pop(key, None)
+                continue
+            if status >= 400:
+                self._branch_heads.pop(key, None)
+                self._sha_cache.pop(key, None)
+                logger.error(f"HTTPError updating ref for {branch_name}: {status} {_reason(status)} - {_body_excerpt(ref_json, text)}")
+                return self._error_payload(status, ref_json, text)
+
+            self._branch_heads[key] = (commit_json["sha"], tree_json["sha"])
+            self._sha_cache.pop(key, None)
+            return commit_json
+        return {"error": f"Could not update branch '{branch_name}': its head kept moving."}
+
+    async def create_commit_on_branch(self, owner: str, repo: str, branch_name: str, commit_message: str, file_path: str, file_content: Union[str, bytes]) -> Dict[str, Any]:
         """
         Creates or updates a file in a branch and commits it.
+
+        The file is uploaded as a blob and committed through the Git Data API
+        on top of the branch head, so no per-file SHA lookup is needed. An
+        existing file keeps its mode (e.g., executable); a new one gets
+        '100644'. Text content is sent as-is with UTF-8 encoding; only binary
+        content is base64-encoded.
         """
         if not self.token:
             logger.error("GitHub token is required to commit files.")
@@ -320,56 +942,128 @@ class GitHubClient:
 
         logger.info(f"GitHubClient: Committing to {owner}/{repo} on branch '{branch_name}', file '{file_path}'")
 
-        endpoint = f"/repos/{owner}/{repo}/contents/{file_path}"
+        blob_json = await self._create_blob(owner, repo, file_path, file_content)
+        if "error" in blob_json:
+            return blob_json
 
-        try:
-            content_bytes = file_content.encode('utf-8')
-            encoded_content = base64.b64encode(content_bytes).decode('utf-8')
-        except Exception as e:
-            logger.error(f"Failed to encode file content for {file_path}: {e}")
-            return {"error": f"Failed to encode file content: {str(e)}"}
+        # The mode is left to _commit_tree, which keeps that of an existing file.
+        tree_entry = {"path": file_path, "mode": None, "type": "blob", "sha": blob_json["sha"]}
+        commit_json = await self._commit_tree(owner, repo, branch_name, commit_message, [tree_entry])
+        if "error" in commit_json:
+            return commit_json
 
-        payload: Dict[str, Any] = {
-            "message": commit_message,
-            "content": encoded_content,
-            "branch": branch_name
+        logger.info(f"File '{file_path}' committed successfully to {branch_name}. SHA: {commit_json.get('sha')}")
+        return {
+            "message": "File committed successfully.",
+            "commit_sha": commit_json.get("sha"),
+            "commit_url": commit_json.get("html_url"),
+            "file_sha": blob_json["sha"],
+            "branch": branch_name,
+            "file_path": file_path,
+            "details": commit_json
         }
 
-        existing_file_sha = await self.get_file_sha(owner, repo, file_path, branch_name)
-        if existing_file_sha:
-            payload["sha"] = existing_file_sha
-            logger.debug(f"  Updating existing file '{file_path}' (SHA: {existing_file_sha}).")
+    async def _create_blob(self, owner: str, repo: str, file_path: str, file_content: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Uploads file content as a blob.
+
+        Text content is sent as-is with UTF-8 encoding; only binary content is
+        base64-encoded. Returns the blob details (including its 'sha'), or an
+        error payload.
+        """
+        if isinstance(file_content, str):
+            blob_payload = {"content": file_content, "encoding": "utf-8"}
         else:
-            logger.debug(f"  Creating new file '{file_path}'.")
+            try:
+                blob_payload = {"content": base64.b64encode(file_content).decode('ascii'), "encoding": "base64"}
+            except Exception as e:
+                logger.error(f"Failed to encode file content for {file_path}: {e}")
+                return {"error": f"Failed to encode file content: {str(e)}"}
 
-        try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("PUT", endpoint, json=payload))
-            response.raise_for_status()
-
-            response_json = response.json()
-            commit_details = response_json.get("commit", {})
-            content_details = response_json.get("content", {})
-            logger.info(f"File '{file_path}' committed successfully to {branch_name}. SHA: {commit_details.get('sha')}")
-            return {
-                "message": "File committed successfully.",
-                "commit_sha": commit_details.get("sha"),
-                "commit_url": commit_details.get("html_url"),
-                "file_sha": content_details.get("sha"),
-                "file_url": content_details.get("html_url"),
-                "branch": branch_name,
-                "file_path": file_path,
-                "details": response_json
-            }
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTPError committing file {file_path}: {e.response.status_code} {e.response.reason} - {e.response.text[:100]}")
-            error_details = {"error": f"HTTPError: {e.response.status_code} {e.response.reason}", "details_text": e.response.text}
-            try: error_details["details_json"] = e.response.json()
-            except ValueError: pass
-            return error_details
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during commit of {file_path}: {str(e)}")
-            return {"error": f"An unexpected error occurred during commit: {str(e)}"}
+        status, blob_json, text = await self._make_request(
+            "POST", f"/repos/{owner}/{repo}/git/blobs", json=blob_payload
+        )
+        if status >= 400 or not isinstance(blob_json, dict):
+            logger.error(f"HTTPError uploading blob for {file_path}: {status} {_reason(status)} - {_body_excerpt(blob_json, text)}")
+            return self._error_payload(status, blob_json, text)
+        return blob_json
+
+    async def commit_file_operations(
+        self,
+        owner: str,
+        repo: str,
+        branch_name: str,
+        commit_message: str,
+        file_changes: List[Tuple[str, Union[str, bytes]]],
+        files_to_delete: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Applies file creations, updates and deletions to a branch in one commit.
+
+        Parameters
+        ----------
+        owner : str
+            The owner of the repository.
+        repo : str
+            The name of the repository.
+        branch_name : str
+            The branch to commit to.
+        commit_message : str
+            The commit message.
+        file_changes : list of tuple of (str, str or bytes)
+            The (path, new content) of each file to create or update.
+        files_to_delete : list of str, optional
+            The paths of files to delete, by default None.
+
+        Returns
+        -------
+        dict
+            The commit details, or an error payload.
+
+        Notes
+        -----
+        Each file's content is uploaded as a blob, with the uploads running
+        concurrently, then a single tree holds all changes, with deletions as
+        entries whose `sha` is null. Updated files keep their mode (so
+        executables and symlinks stay what they are); new files get '100644'.
+        The tree is committed on top of the branch head. A rename is therefore one commit
+        instead of a delete commit followed by a create commit, and no
+        per-file SHA lookups are needed for deletions. Deleting a path that
+        does not exist on the branch fails the whole commit.
+        """
+        if not self.token:
+            logger.error("GitHub token is required to commit files.")
+            return {"error": "GitHub token is required to commit files."}
+        files_to_delete = files_to_delete or []
+        if not file_changes and not files_to_delete:
+            return {"error": "No file operations provided to commit."}
+
+        logger.info(f"GitHubClient: Committing {len(file_changes)} change(s) and {len(files_to_delete)} deletion(s) to {owner}/{repo} on branch '{branch_name}'")
+        # Blobs are independent of each other, so they are uploaded concurrently
+        # (bounded by the client's request semaphore).
+        blob_results = await asyncio.gather(*(
+            self._create_blob(owner, repo, file_path, file_content) for file_path, file_content in file_changes
+        ))
+        tree_entries: List[Dict[str, Any]] = []
+        for (file_path, _), blob_json in zip(file_changes, blob_results):
+            if "error" in blob_json:
+                return blob_json
+            tree_entries.append({"path": file_path, "mode": None, "type": "blob", "sha": blob_json["sha"]})
+        for file_path in files_to_delete:
+            tree_entries.append({"path": file_path, "mode": None, "type": "blob", "sha": None})
+
+        commit_json = await self._commit_tree(owner, repo, branch_name, commit_message, tree_entries)
+        if "error" in commit_json:
+            return commit_json
+        logger.info(f"Committed {len(tree_entries)} file operation(s) to {branch_name}. SHA: {commit_json.get('sha')}")
+        return {
+            "message": "File operations committed successfully.",
+            "commit_sha": commit_json.get("sha"),
+            "commit_url": commit_json.get("html_url"),
+            "branch": branch_name,
+            "files_changed": [file_path for file_path, _ in file_changes],
+            "files_deleted": files_to_delete,
+        }
 
     async def delete_file_on_branch(self, owner: str, repo: str, branch_name: str, file_path: str, commit_message: str, sha: str) -> Dict[str, Any]:
         """
@@ -386,21 +1080,14 @@ class GitHubClient:
             "branch": branch_name
         }
         logger.info(f"GitHubClient: Deleting file {owner}/{repo}/{file_path} on branch '{branch_name}' (SHA: {sha})")
-        try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("DELETE", endpoint, json=payload))
-            response.raise_for_status()
-            logger.info(f"File '{file_path}' deleted successfully from {branch_name}.")
-            return response.json() 
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTPError deleting file {file_path}: {e.response.status_code} {e.response.reason} - {e.response.text[:100]}")
-            error_details = {"error": f"HTTPError deleting file: {e.response.status_code} {e.response.reason}", "details_text": e.response.text}
-            try: error_details["details_json"] = e.response.json()
-            except ValueError: pass
-            return error_details
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during file deletion for {file_path}: {str(e)}")
-            return {"error": f"An unexpected error occurred during file deletion: {str(e)}"}
+        status, data, text = await self._make_request("DELETE", endpoint, json=payload)
+        if status >= 400:
+            logger.error(f"HTTPError deleting file {file_path}: {status} {_reason(status)} - {_body_excerpt(data, text)}")
+            return self._error_payload(status, data, text, prefix="HTTPError deleting file")
+        logger.info(f"File '{file_path}' deleted successfully from {branch_name}.")
+        self._branch_heads.pop((owner, repo, branch_name), None)
+        self._sha_cache.pop((owner, repo, branch_name), None)
+        return data if isinstance(data, dict) else {"text_response": text}
 
     async def list_files_in_repo(self, owner: str, repo: str, branch: str) -> Dict[str, Any]:
         """
@@ -410,20 +1097,35 @@ class GitHubClient:
         if not latest_sha:
             logger.error(f"Could not get latest commit SHA for branch '{branch}' in {owner}/{repo} to list files.")
             return {"error": f"Could not get latest commit SHA for branch '{branch}'."}
+        tree_files = await self._get_tree_files(owner, repo, latest_sha)
+        if "error" in tree_files:
+            return tree_files
+        files = [file_path for file_path, _ in tree_files["files"]]
+        logger.debug(f"Found {len(files)} files in {owner}/{repo} on branch {branch}.")
+        return {"files": files}
 
-        endpoint = f"/repos/{owner}/{repo}/git/trees/{latest_sha}?recursive=true"
-        try:
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: self._make_request("GET", endpoint))
-            response.raise_for_status()
-            response_json = response.json()
-            files = [item['path'] for item in response_json.get('tree', []) if item.get('type') == 'blob']
-            logger.debug(f"Found {len(files)} files in {owner}/{repo} on branch {branch}.")
-            return {"files": files}
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTPError listing files for {owner}/{repo} on branch {branch}: {e.response.status_code} {e.response.reason} - {e.response.text[:100]}")
-            return {"error": f"HTTPError: {e.response.status_code} {e.response.reason}", "details_text": e.response.text}
-        except Exception as e:
-            logger.error(f"Failed to list files for {owner}/{repo} on branch {branch}: {str(e)}")
-            return {"error": f"Failed to list files for {owner}/{repo} on branch {branch}: {str(e)}"}
-    
\ No newline at end of file
+    async def _get_tree_files(self, owner: str, repo: str, tree_sha: str) -> Dict[str, Any]:
+        """
+        Lists the files of a tree (or of a commit's tree) recursively.
+
+        Returns a dictionary whose 'files' holds the (path, mode) of each file,
+        or an error payload. Results are cached by SHA.
+        """
+        tree_key = (owner, repo, tree_sha)
+        if tree_key in self._tree_cache:
+            self._tree_cache.move_to_end(tree_key)
+            return {"files": self._tree_cache[tree_key]}
+
+        endpoint = f"/repos/{owner}/{repo}/git/trees/{tree_sha}?recursive=true"
+        status, response_json, text = await self._make_request("GET", endpoint)
+        if status >= 400:
+            logger.error(f"HTTPError listing files for {owner}/{repo} at {tree_sha}: {status} {_reason(status)} - {_body_excerpt(response_json, text)}")
+            return {"error": f"HTTPError: {status} {_reason(status)}", "details_text": _body_excerpt(response_json, text, 500)}
+        if not isinstance(response_json, dict):
+            logger.error(f"Failed to list files for {owner}/{repo} at {tree_sha}: unexpected response body.")
+            return {"error": f"Failed to list files for {owner}/{repo} at {tree_sha}: unexpected response body."}
+        if response_json.get("truncated"):
+            logger.warning(f"The file tree of {owner}/{repo} at {tree_sha} is too large to list in full.")
+        files = tuple((item['path'], item['mode']) for item in response_json.get('tree', []) if item.get('type') == 'blob')
+        self._remember(self._tree_cache, tree_key, files)
+        return {"files": files}
@@ -1,29 +1,60 @@
 import argparse
 import asyncio
+import hashlib
+import io
 import os
 import sys
 import re
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
 # Logger for this module
 logger = logging.getLogger(__name__)
 
-from agents import Runner, ToolCallItem, ToolCallOutputItem
-from .agents import (
-    BranchCreatorAgent,
-    CodeCommitterAgent,
-    CodeProposerAgent,
-    CodeReviewerAgent,
-    CommentPosterAgent,
-    IssueTriagerAgent,
-    FileIdentifierAgent,
-    PlannerAgent,
-    ChangeExplainerAgent
+from agents import ToolCallItem, ToolCallOutputItem
+from .agents import CodeReviewerAgent, get_workflow_agents, ReusableAgent
+from .cache import llm_cache
+from .resilience import CircuitBreaker
+from .tools import apply_unified_diff, github_client, parse_github_issue_url
+
+# The proposer's instructions already describe the operation format and stay in the
+# conversation, so revision requests only point back to them.
+REVISION_OPERATION_RULES = (
+    "Please provide a revised set of file operations in the same format as before, "
+    "using the provided original content as the base for modifications (patches are always against the original content).\n"
 )
-from .github_client import GitHubClient
-from .tools import parse_github_issue_url
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """
+    Returns the semaphore that bounds concurrent LLM calls.
+
+    The flow calls the Runner directly (to read token usage), so it acquires
+    the same semaphore that `ReusableAgent.run_agent` uses; see
+    `ReusableAgent.llm_semaphore`.
+    """
+    return ReusableAgent.llm_semaphore()
+
+
+# Section headers and footer of the summary comment posted to the issue.
+TRIAGE_SUMMARY_HEADER = "\n\n**Triage Summary:**\n"
+GENERATED_PLAN_HEADER = "\n\n**Generated Plan:**\n"
+FILE_IDENTIFICATION_HEADER = "\n\n**File Identification:**\n"
+TECHNICAL_REVIEW_HEADER = "\n\n**Technical Review:**\n"
+STYLE_REVIEW_HEADER = "\n\n**Style Review:**\n"
+COMMIT_STATUS_HEADER = "\n\n**Commit Status:**\n"
+COMMENT_FOOTER = "\n\n---\n*This comment was automatically generated by OctoAgent, an experimental AI-powered issue-solving assistant.*"
+
+# A JSON document wrapped in a markdown code fence.
+JSON_FENCE_RE = re.compile(r"^```(?:json)?\s*\n(.*?)\n?```$", re.DOTALL)
+# Stands in for reviews cancelled because another review of the same cycle already asked for changes.
+REVIEW_SKIPPED_TEXT = "Not reviewed in this cycle: another review already requested changes."
+
+# Shared by all flows in the process: once transient provider errors keep piling up,
+# the remaining LLM calls (across all issues) fail fast. It does not retry: the OpenAI
+# client already retries each request, and re-running a whole agent run could repeat
+# tool calls with side effects, such as posting a comment or committing.
+llm_circuit_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0, max_retries=0)
 
 
 def parse_file_operations(markdown_text: Optional[str]) -> List[Dict[str, str]]:
@@ -36,6 +67,11 @@ def parse_file_operations(markdown_text: Optional[str]) -> List[Dict[str, str]]:
     ```python
     # code for file1
     ```
+    Patch for `path/to/file4.py`:
+    ```diff
+    @@ -1,2 +1,2 @@
+    ...
+    ```
     Delete file: `path/to/file2.py`
     No changes needed for `path/to/file3.py`.
 
@@ -43,7 +79,8 @@ def parse_file_operations(markdown_text: Optional[str]) -> List[Dict[str, str]]:
     -------
     list of dict
         Each dict contains "file_path", "action" ('modify', 'delete', 'no_change'),
-        and "code" (if action is 'modify').
+        and, if action is 'modify', either "code" or "diff" (a unified diff
+        to apply to the original content).
     """
     if not markdown_text:
         return []
@@ -53,6 +90,10 @@ def parse_file_operations(markdown_text: Optional[str]) -> List[Dict[str, str]]:
         r"(?:### )?Changes for `([^`]+?\.[\w./-]+)`:.*?\s*```(?:[a-zA-Z0-9\+\-\#\.]*?)?\s*\n(.*?)\n```",
         re.DOTALL | re.MULTILINE
     )
+    patch_pattern = re.compile(
+        r"(?:### )?Patch for `([^`]+?\.[\w./-]+)`:.*?\s*```(?:diff|patch)?[ \t]*\n(.*?)\n```",
+        re.DOTALL | re.MULTILINE
+    )
     delete_pattern = re.compile(
         r"Delete file: `([^`]+?\.[\w./-]+)`",
         re.MULTILINE
@@ -63,7 +104,7 @@ def parse_file_operations(markdown_text: Optional[str]) -> List[Dict[str, str]]:
     )
 
     all_matches = []
-    for match_type, pattern_obj in [("modify", modify_pattern), ("delete", delete_pattern), ("no_change", no_change_pattern)]:
+    for match_type, pattern_obj in [("modify", modify_pattern), ("patch", patch_pattern), ("delete", delete_pattern), ("no_change", no_change_pattern)]:
         for match in pattern_obj.finditer(markdown_text):
             all_matches.append({"type": match_type, "match_obj": match, "start_pos": match.start()})
 
@@ -79,6 +120,14 @@ def parse_file_operations(markdown_text: Optional[str]) -> List[Dict[str, str]]:
                 "code": code_content.strip(),
                 "action": "modify"
             })
+        elif match_type == "patch":
+            file_path, diff_content = match_obj.groups()
+            # Not stripped: a leading space is part of the diff's first context line.
+            operations.append({
+                "file_path": file_path.strip(),
+                "diff": diff_content,
+                "action": "modify"
+            })
         elif match_type == "delete":
             file_path = match_obj.groups()[0]
             operations.append({
@@ -94,6 +143,96 @@ def parse_file_operations(markdown_text: Optional[str]) -> List[Dict[str, str]]:
     return operations
 
 
+def is_review_approval(review: str) -> bool:
+    """
+    Returns True if a reviewer's response approves the proposed operations.
+
+    Only the verdict the review starts with counts, so a requested revision that
+    mentions approval later on (e.g., "would be approved once ...") is not one.
+    """
+    verdict_match = CodeReviewerAgent.VERDICT_RE.match(review)
+    return bool(verdict_match) and verdict_match.group(1).lower() != "needs revision"
+
+
+def combine_file_reviews(file_paths: List[str], reviews: List[str]) -> str:
+    """
+    Combines one reviewer's per-file reviews into a single feedback text.
+
+    A single review is returned as is; otherwise each review is prefixed
+    with the file it covers.
+    """
+    if len(reviews) == 1:
+        return reviews[0]
+    return "\n\n".join(f"`{file_path}`: {review}" for file_path, review in zip(file_paths, reviews))
+
+
+def parse_issue_analysis(analysis_output: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parses the JSON output of the IssueAnalysisAgent.
+
+    Parameters
+    ----------
+    analysis_output : str or None
+        The agent's final output, optionally wrapped in a code fence.
+
+    Returns
+    -------
+    dict or None
+        A dict with "triage" (str), "plan" (str) and "target_files"
+        (list of str), or None if the output is not valid.
+    """
+    if not analysis_output:
+        return None
+    text = analysis_output.strip()
+    fence_match = JSON_FENCE_RE.match(text)
+    if fence_match:
+        text = fence_match.group(1)
+    try:
+        analysis = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(analysis, dict) or not isinstance(analysis.get("triage"), str) or not isinstance(analysis.get("plan"), str):
+        return None
+    target_files = analysis.get("target_files")
+    if not isinstance(target_files, list):
+        return None
+    analysis["target_files"] = sorted({str(path).strip().strip('`') for path in target_files if str(path).strip()})
+    return analysis
+
+
+def extract_tool_outputs(new_items: Optional[List[Any]]) -> Dict[str, Any]:
+    """
+    Maps the tools called during an agent run to their outputs.
+
+    Parameters
+    ----------
+    new_items : list or None
+        The `new_items` of an agent run result.
+
+    Returns
+    -------
+    dict
+        Tool name to the tool's return value. If a tool was called more than
+        once, the output of its first call is kept.
+    """
+    outputs: Dict[str, Any] = {}
+    call_names: Dict[Any, str] = {}
+    last_call_name: Optional[str] = None
+    for item in new_items or ():
+        if isinstance(item, ToolCallItem):
+            raw_call = item.raw_item
+            last_call_name = getattr(raw_call, 'name', None) or getattr(getattr(raw_call, 'function', None), 'name', None)
+            call_names[getattr(raw_call, 'call_id', None)] = last_call_name
+        elif isinstance(item, ToolCallOutputItem):
+            raw_output = item.raw_item
+            call_id = raw_output.get('call_id') if isinstance(raw_output, dict) else getattr(raw_output, 'call_id', None)
+            # Outputs are matched to their call by id; without one, to the most recent call.
+            tool_name = call_names.get(call_id, last_call_name) if call_id is not None else last_call_name
+            if tool_name is not None:
+                outputs.setdefault(tool_name, item.output)
+    return outputs
+
+
 async def solve_github_issue_flow(
     issue_url: str,
     repo_owner_override: Optional[str] = None,
@@ -102,25 +241,89 @@ async def solve_github_issue_flow(
     max_review_cycles_override: int = 3,
     show_token_summary: bool = True,
     model_to_use: str = "gpt-4o",
+    combined_analysis: bool = False,
+    combined_review: bool = False,
+    issue_context: Optional[Dict[str, Any]] = None,
 ):
     """
     Orchestrates the end-to-end flow of agents to solve a GitHub issue.
+
+    `issue_context` takes the issue and default branch already fetched by the
+    caller, in the form `GitHubClient.get_issue_context` returns, so callers
+    solving several issues can fetch them all in one batch.
+
+    With `combined_analysis`, triage, planning and file identification are
+    done by one `IssueAnalysisAgent` run instead of three separate agents,
+    falling back to the separate agents if its output cannot be parsed.
+
+    With `combined_review`, each file operation gets one
+    `MultiAspectReviewerAgent` run covering both review aspects instead of one
+    run per aspect, falling back to the per-aspect reviewers if its output
+    cannot be parsed.
+
+    Returns
+    -------
+    dict
+        The outcome of the run, with the keys 'issue_url', 'status'
+        ('completed', 'no_files' or 'error'), 'error' (or None), 'branch'
+        (the branch committed to, or None), 'committed_files',
+        'prompt_tokens', 'completion_tokens' and 'reviews_stopped_early' (the
+        number of streamed reviews cancelled on an approval, whose usage the
+        token totals leave out). Callers that run the flow as a background
+        job can store this as the job's result.
     """
     logger.info(f"🚀 Starting GitHub Issue Solver for: {issue_url}")
     logger.info(f"Using model for agent instantiations: {model_to_use}")
 
     total_prompt_tokens = 0
     total_completion_tokens = 0
+    # Reviews cancelled on an approval never report their usage, so the totals leave them out.
+    reviews_stopped_early = 0
     actual_model_name_reported = model_to_use 
 
-    runner = Runner()
+    runner = ReusableAgent._get_runner()
+    committed_branch: Optional[str] = None
+    committed_files: List[str] = []
+
+    def flow_result(status: str, error: Optional[str] = None) -> Dict[str, Any]:
+        """Builds the dict returned by the flow."""
+        return {
+            "issue_url": issue_url,
+            "status": status,
+            "error": error,
+            "branch": committed_branch,
+            "committed_files": committed_files,
+            "prompt_tokens": total_prompt_tokens,
+            "completion_tokens": total_completion_tokens,
+            "reviews_stopped_early": reviews_stopped_early,
+        }
 
     async def run_agent_and_track_usage(agent_instance, input_text, **kwargs):
-        nonlocal total_prompt_tokens, total_completion_tokens, actual_model_name_reported
         agent_name_for_log = agent_instance.name if hasattr(agent_instance, 'name') else "UnknownAgent"
         logger.debug(f"Running agent: {agent_name_for_log}, Input (first 100 chars): {input_text[:100]}...")
-        run_result = await runner.run(agent_instance, input=input_text, **kwargs)
-        
+        run_cache_key = None
+        if not kwargs and isinstance(agent_instance, ReusableAgent):
+            run_cache_key = agent_instance.response_cache_key(input_text, kind="run_result")
+        if run_cache_key is not None:
+            cached_run = llm_cache.get(run_cache_key)
+            if cached_run is not None:
+                # Nothing was sent to the model, so there is no token usage to add.
+                logger.info(f"[{agent_name_for_log}] Using cached response.")
+                return cached_run
+        async def run_once():
+            async with get_llm_semaphore():
+                return await runner.run(agent_instance, input=input_text, **kwargs)
+
+        run_result = await llm_circuit_breaker.call(run_once)
+        record_usage(agent_instance, run_result)
+        if run_cache_key is not None:
+            llm_cache.set(run_cache_key, run_result)
+        return run_result
+
+    def record_usage(agent_instance, run_result):
+        """Adds the token usage of a finished run to the flow's totals."""
+        nonlocal total_prompt_tokens, total_completion_tokens, actual_model_name_reported
+        agent_name_for_log = agent_instance.name if hasattr(agent_instance, 'name') else "UnknownAgent"
         logger.debug(f"[{agent_name_for_log}] --- RunResult Details ---")
         logger.debug(f"[{agent_name_for_log}] type(run_result): {type(run_result)}")
         try:
@@ -191,13 +394,11 @@ async def solve_github_issue_flow(
             (direct_model_from_response is None) and \
             hasattr(run_result, 'new_items') and run_result.new_items:
             for item in run_result.new_items: 
-                model_from_item_raw = None
-                if hasattr(item, 'raw_item'):
-                    raw_item_obj = getattr(item, 'raw_item')
-                    if hasattr(raw_item_obj, 'model') and isinstance(getattr(raw_item_obj, 'model'), str):
-                        model_from_item_raw = getattr(raw_item_obj, 'model')
-                    elif isinstance(raw_item_obj, dict):
-                        model_from_item_raw = raw_item_obj.get('model')
+                raw_item_obj = getattr(item, 'raw_item', None)
+                if isinstance(raw_item_obj, dict):
+                    model_from_item_raw = raw_item_obj.get('model')
+                else:
+                    model_from_item_raw = getattr(raw_item_obj, 'model', None)
                 if model_from_item_raw and isinstance(model_from_item_raw, str):
                     actual_model_name_reported = model_from_item_raw
                     logger.debug(f"[{agent_name_for_log}] Updated actual_model_name_reported from item.raw_item (fallback) to '{actual_model_name_reported}'")
@@ -205,8 +406,35 @@ async def solve_github_issue_flow(
         
         if not found_tokens_for_this_run:
             logger.debug(f"[{agent_name_for_log}] Ultimately, no token usage data was successfully extracted for this agent run.")
-            
-        return run_result
+
+    async def run_reviewer_streamed(reviewer_instance, input_text):
+        """
+        Streams a review through `CodeReviewerAgent.review_streamed`, which
+        stops reading as soon as the reviewer approves. Returns the review text.
+        """
+        nonlocal reviews_stopped_early
+        agent_name_for_log = reviewer_instance.name if hasattr(reviewer_instance, 'name') else "UnknownAgent"
+        review_cache_key = reviewer_instance.response_cache_key(input_text) if isinstance(reviewer_instance, ReusableAgent) else None
+        if review_cache_key is not None:
+            cached_review = llm_cache.get(review_cache_key)
+            if cached_review is not None:
+                logger.info(f"[{agent_name_for_log}] Using cached response.")
+                return cached_review
+
+        async def stream_once():
+            async with get_llm_semaphore():
+                return await reviewer_instance.review_streamed(input_text)
+
+        review_text, streamed_run = await llm_circuit_breaker.call(stream_once)
+        if streamed_run is None:
+            # Cut short on an approval: the response never completed, so no usage is reported for it.
+            reviews_stopped_early += 1
+        else:
+            record_usage(reviewer_instance, streamed_run)
+        # An approval cut short is just its verdict, so it is cached like a complete review.
+        if review_cache_key is not None:
+            llm_cache.set(review_cache_key, review_text)
+        return review_text
 
     repo_owner = repo_owner_override
     repo_name = repo_name_override
@@ -218,12 +446,22 @@ async def solve_github_issue_flow(
             repo_name = repo_name or parsed_info[1]
         else:
             logger.error(f"Could not parse repository owner and name from issue URL: {issue_url}")
-            return
+            return flow_result("error", error="Could not parse repository owner and name from the issue URL.")
     logger.info(f"Target Repository: {repo_owner}/{repo_name}")
 
-    github_client = GitHubClient()
     logger.info("📋 Fetching default branch name...")
-    default_branch_name = await github_client.get_default_branch(repo_owner, repo_name)
+    # One request fetches the issue along with the default branch and its head, so the
+    # agents' issue download and file listing below are served from the client's caches.
+    parsed_issue_ref = parse_github_issue_url(issue_url)
+    if issue_context is None and parsed_issue_ref and parsed_issue_ref[:2] == (repo_owner, repo_name):
+        issue_context = await github_client.get_issue_context(repo_owner, repo_name, parsed_issue_ref[2])
+    if issue_context is not None:
+        if issue_context["issue"].get("status") == "not_found":
+            logger.error(issue_context["issue"]["error"])
+            return flow_result("error", error=issue_context["issue"]["error"])
+        default_branch_name = issue_context.get("default_branch")
+    else:
+        default_branch_name = await github_client.get_default_branch(repo_owner, repo_name)
     if not default_branch_name:
         logger.error(f"Could not determine the default branch for {repo_owner}/{repo_name}.")
         if show_token_summary:
@@ -234,40 +472,54 @@ async def solve_github_issue_flow(
             logger.info(f"Total Completion Tokens: {total_completion_tokens}")
             logger.info(f"Overall Total Tokens: {overall_total_tokens_err}")
             logger.info("-------------------------------------\n")
-        return
+        return flow_result("error", error="Could not determine the default branch.")
     logger.info(f"Default branch is '{default_branch_name}'.\n")
 
-    triager = IssueTriagerAgent(model=model_to_use)
-    planner = PlannerAgent(model=model_to_use)
-    file_identifier = FileIdentifierAgent(model=model_to_use)
-    code_proposer = CodeProposerAgent(model=model_to_use)
-    change_explainer = ChangeExplainerAgent(model=model_to_use)
-    technical_reviewer = CodeReviewerAgent(model=model_to_use, review_aspect="technical correctness and efficiency")
-    style_reviewer = CodeReviewerAgent(model=model_to_use, review_aspect="code style and readability")
-    branch_creator = BranchCreatorAgent(model=model_to_use)
-    committer = CodeCommitterAgent(model=model_to_use)
-    comment_poster = CommentPosterAgent(model=model_to_use)
+    # The agents are built once per model and shared by every run of the flow.
+    workflow_agents = get_workflow_agents(model_to_use)
+    triager = workflow_agents.triager
+    issue_analyzer = workflow_agents.issue_analyzer if combined_analysis else None
+    planner = workflow_agents.planner
+    file_identifier = workflow_agents.file_identifier
+    code_proposer = workflow_agents.code_proposer
+    change_explainer = workflow_agents.change_explainer
+    batch_change_explainer = workflow_agents.batch_change_explainer
+    technical_reviewer = workflow_agents.technical_reviewer
+    style_reviewer = workflow_agents.style_reviewer
+    multi_aspect_reviewer = workflow_agents.multi_aspect_reviewer if combined_review else None
+    branch_and_committer = workflow_agents.branch_and_committer
+    comment_poster = workflow_agents.comment_poster
     
     # --- Step 1: Triaging Issue ---
-    logger.info("\n🔍 Step 1: Triaging Issue...")
-    triage_result_run = await run_agent_and_track_usage(triager, f"Please triage the GitHub issue at {issue_url}")
-    triage_output_summary = triage_result_run.final_output
+    issue_analysis: Optional[Dict[str, Any]] = None
+    if issue_analyzer is not None:
+        logger.info("\n🔍 Step 1: Analyzing Issue (triage, plan and target files)...")
+        analysis_input = (
+            f"Please analyze the GitHub issue at {issue_url}.\n"
+            f"Repository: {repo_owner}/{repo_name}\nDefault Branch: {default_branch_name}\n"
+        )
+        triage_result_run = await run_agent_and_track_usage(issue_analyzer, analysis_input)
+        issue_analysis = parse_issue_analysis(triage_result_run.final_output)
+        if issue_analysis is None:
+            logger.warning("Issue analysis output could not be parsed; falling back to separate triage, planning and file identification.")
+    if issue_analysis is None:
+        logger.info("\n🔍 Step 1: Triaging Issue...")
+        triage_result_run = await run_agent_and_track_usage(triager, f"Please triage the GitHub issue at {issue_url}")
+        triage_output_summary = triage_result_run.final_output
+    else:
+        triage_output_summary = issue_analysis["triage"]
     
     issue_details_from_tool: Optional[Dict[str, Any]] = None
     new_items_triage: Optional[List[Any]] = getattr(triage_result_run, "new_items", None)
-    if new_items_triage:
-        for item in new_items_triage:
-            if type(item).__name__ == 'ToolCallOutputItem':
-                content = getattr(item, 'output', getattr(item, 'content', None))
-                if isinstance(content, dict) and 'number' in content:
-                    issue_details_from_tool = content
-                    break
+    downloaded_issue = extract_tool_outputs(new_items_triage).get('download_github_issue')
+    if isinstance(downloaded_issue, dict) and 'number' in downloaded_issue:
+        issue_details_from_tool = downloaded_issue
     if not issue_details_from_tool:
         model_response_item_content = None
         if new_items_triage:
             for item in new_items_triage:
-                if hasattr(item, 'raw_item') and isinstance(getattr(item, 'raw_item'), dict):
-                    raw_item_dict = getattr(item, 'raw_item')
+                raw_item_dict = getattr(item, 'raw_item', None)
+                if isinstance(raw_item_dict, dict):
                     if 'choices' in raw_item_dict and isinstance(raw_item_dict['choices'], list) and raw_item_dict['choices']:
                         message_content_str = raw_item_dict['choices'][0].get('message', {}).get('content')
                         if message_content_str:
@@ -292,7 +544,7 @@ async def solve_github_issue_flow(
                     logger.info(f"Total Completion Tokens: {total_completion_tokens}")
                     logger.info(f"Overall Total Tokens: {overall_total_tokens_err}")
                     logger.info("-------------------------------------\n")
-                return
+                return flow_result("error", error="Could not get structured issue details from the triage step.")
 
     issue_number = issue_details_from_tool.get("number")
     issue_title = issue_details_from_tool.get("title", "Unknown Title")
@@ -310,35 +562,49 @@ async def solve_github_issue_flow(
             logger.info(f"Total Completion Tokens: {total_completion_tokens}")
             logger.info(f"Overall Total Tokens: {overall_total_tokens_err}")
             logger.info("-------------------------------------\n")
-        return
+        return flow_result("error", error="Issue number not found in triaged details.")
     logger.info(f"Triager Output Summary:\n{triage_output_summary}\n")
     logger.info(f"Successfully processed issue #{issue_number}: '{issue_title}'")
 
-    # --- Step 1.2: Generating Plan ---
-    logger.info(f"\n📝 Step 1.2: Generating Plan for issue #{issue_number}...")
-    planner_input = (
-        f"Based on the following triaged GitHub issue, create a step-by-step plan for resolution:\n"
-        f"Issue Title: {issue_title}\nIssue Body:\n{issue_body}\n\n"
-        f"Labels: {', '.join(issue_labels)}\nTriage Summary:\n{triage_output_summary}\n"
-    )
-    planner_run = await run_agent_and_track_usage(planner, planner_input)
-    generated_plan = planner_run.final_output
-    logger.info(f"Generated Plan:\n{generated_plan}\n")
+    # --- Step 1.2: Generating Plan and Identifying Target Files ---
+    # The file identifier works from the issue itself, not the plan, so both agents run concurrently.
+    identified_file_paths_raw: List[str] = []
+    if issue_analysis is not None:
+        generated_plan = issue_analysis["plan"]
+        logger.info(f"Generated Plan (from issue analysis):\n{generated_plan}\n")
+    else:
+        logger.info(f"\n📝 Step 1.2: Generating Plan for issue #{issue_number}...")
+        planner_input = (
+            f"Based on the following triaged GitHub issue, create a step-by-step plan for resolution:\n"
+            f"Issue Title: {issue_title}\nIssue Body:\n{issue_body}\n\n"
+            f"Labels: {', '.join(issue_labels)}\nTriage Summary:\n{triage_output_summary}\n"
+        )
+        if target_file_override:
+            planner_run = await run_agent_and_track_usage(planner, planner_input)
+            identifier_run = None
+        else:
+            logger.info(f"\n📑 Step 1.5: Identifying Target Files for issue #{issue_number}...")
+            identifier_input = (
+                f"Based on the following GitHub issue, identify the file(s) that need to be modified, created, or are relevant to a rename/delete operation.\n"
+                f"Repository: {repo_owner}/{repo_name}\nDefault Branch: {default_branch_name}\n"
+                f"Issue Title: {issue_title}\nIssue Body:\n{issue_body}\n\n"
+                f"Labels: {', '.join(issue_labels)}\n"
+            )
+            planner_run, identifier_run = await asyncio.gather(
+                run_agent_and_track_usage(planner, planner_input),
+                run_agent_and_track_usage(file_identifier, identifier_input),
+            )
+        generated_plan = planner_run.final_output
+        logger.info(f"Generated Plan:\n{generated_plan}\n")
 
     # --- Step 1.5: Identify Target Files or Use Override ---
-    identified_file_paths_raw: List[str] = []
     if target_file_override:
         identified_file_paths_raw = [f.strip() for f in target_file_override.split(',') if f.strip()]
         logger.info(f"\n✅ User-specified target file(s): {', '.join(identified_file_paths_raw)}. Skipping file identification step.\n")
+    elif issue_analysis is not None:
+        identified_file_paths_raw = issue_analysis["target_files"]
+        logger.info(f"Issue analysis identified target file(s): {', '.join(identified_file_paths_raw) if identified_file_paths_raw else 'None'}\n")
     else:
-        logger.info(f"\n📑 Step 1.5: Identifying Target Files for issue #{issue_number}...")
-        identifier_input = (
-            f"Based on the following GitHub issue, identify the file(s) that need to be modified, created, or are relevant to a rename/delete operation.\n"
-            f"Repository: {repo_owner}/{repo_name}\nDefault Branch: {default_branch_name}\n"
-            f"Issue Title: {issue_title}\nIssue Body:\n{issue_body}\n\n"
-            f"Labels: {', '.join(issue_labels)}\nOverall Plan: {generated_plan}\n"
-        )
-        identifier_run = await run_agent_and_track_usage(file_identifier, identifier_input)
         file_output_raw_agent = identifier_run.final_output.strip()
         logger.debug(f"DEBUG: File Identifier Agent Raw Output:\n---\n{file_output_raw_agent}\n---")
         
@@ -382,13 +648,14 @@ async def solve_github_issue_flow(
             logger.info(f"Total Completion Tokens: {total_completion_tokens}")
             logger.info(f"Overall Total Tokens: {overall_total_tokens_err}")
             logger.info("-------------------------------------\n")
-        return
+        return flow_result("no_files")
 
     original_file_contents: Dict[str, Optional[str]] = {}
     if identified_file_paths_raw:
         logger.info(f"\nℹ️ Fetching original content for identified files: {', '.join(identified_file_paths_raw)}...")
+        contents_by_path = await github_client.get_files_content_from_repo(repo_owner, repo_name, identified_file_paths_raw, default_branch_name)
         for fp in identified_file_paths_raw:
-            content_data = await github_client.get_file_content_from_repo(repo_owner, repo_name, fp, default_branch_name)
+            content_data = contents_by_path.get(fp)
             if content_data and content_data.get("status") == "success":
                 original_file_contents[fp] = content_data["content"]
             else: original_file_contents[fp] = None 
@@ -396,9 +663,11 @@ async def solve_github_issue_flow(
     
     # --- Step 2: Propose Initial File Operations ---
     current_proposed_operations: List[Dict[str, str]] = []
+    # Static instructions lead the input so that they form a stable, cacheable prompt prefix.
     proposer_input_parts = [
         f"Based on the following GitHub issue, overall plan, list of relevant files, and their original content (if existing), "
-        f"please propose all necessary file operations (creations, modifications, deletions for renames).\n",
+        f"please propose all necessary file operations (creations, modifications, deletions for renames) "
+        f"in the format described in your instructions.\n\n",
         f"Overall Plan:\n{generated_plan}\n",
         f"Issue Title: {issue_title}\n",
         f"Issue Body:\n{issue_body}\n",
@@ -409,19 +678,61 @@ async def solve_github_issue_flow(
         content = original_file_contents.get(fp)
         if content is not None: proposer_input_parts.append(f"Original content for `{fp}`:\n```\n{content}\n```\n")
         else: proposer_input_parts.append(f"Original content for `{fp}`: This file is new, could not be fetched, or is intended for deletion based on plan.\n")
-    proposer_input_parts.append(
-        "For each operation:\n"
-        "- If creating or modifying a file: State 'Changes for `path/to/file.ext`:' followed by the COMPLETE NEW file content in a markdown block.\n"
-        "- If deleting a file: State 'Delete file: `path/to/file.ext`'.\n"
-        "- If a file from the identified list needs no changes: State 'No changes needed for `path/to/file.ext`.'\n"
-        "If the issue is vague, make a reasonable choice for a simple implementation and state your assumptions in an 'Assumptions Made:' section."
-    )
     proposer_input = "".join(proposer_input_parts)
+
+    async def apply_proposed_patches(operations, conversation_run):
+        """
+        Turns the proposer's patches into full file contents.
+
+        Each 'diff' is applied to the file's original content. Files whose
+        patches do not apply are requested again from the proposer as full
+        file contents, and dropped if they still cannot be resolved. Returns
+        the operations and the proposer run to continue the conversation from.
+        """
+        failed_paths = []
+        for op in operations:
+            if 'diff' not in op:
+                continue
+            diff_text = op.pop('diff')
+            original_content = original_file_contents.get(op['file_path'])
+            try:
+                if original_content is None:
+                    raise ValueError("there is no original content to patch")
+                op['code'] = apply_unified_diff(original_content, diff_text)
+            except ValueError as e:
+                logger.warning(f"Could not apply the patch for `{op['file_path']}`: {e}")
+                failed_paths.append(op['file_path'])
+        if not failed_paths:
+            return operations, conversation_run
+        logger.info(f"Requesting full file content for {len(failed_paths)} file(s) whose patches did not apply...")
+        full_content_message = (
+            "The patches for these files could not be applied to their original content: "
+            f"{', '.join(f'`{fp}`' for fp in failed_paths)}. For each of them, state 'Changes for `path/to/file.ext`:' "
+            "followed by the ENTIRE new file content instead. Do not repeat the other operations."
+        )
+        full_content_run = await run_agent_and_track_usage(
+            code_proposer, conversation_run.to_input_list() + [{"role": "user", "content": full_content_message}]
+        )
+        full_content_ops = {
+            op['file_path']: op for op in parse_file_operations(full_content_run.final_output)
+            if op.get('action') == 'modify' and 'code' in op
+        }
+        resolved_operations = []
+        for op in operations:
+            if op['file_path'] in failed_paths and 'code' not in op:
+                if op['file_path'] not in full_content_ops:
+                    logger.warning(f"Dropping the change to `{op['file_path']}`: no applicable patch or full content was provided.")
+                    continue
+                op = full_content_ops[op['file_path']]
+            resolved_operations.append(op)
+        return resolved_operations, full_content_run
     logger.info(f"\n💡 Step 2: Proposing Initial File Operations for issue #{issue_number}...")
     proposer_run = await run_agent_and_track_usage(code_proposer, proposer_input)
+    proposer_conversation_run = proposer_run
     proposed_solution_markdown = proposer_run.final_output
     logger.debug(f"DEBUG: Code Proposer Raw Output:\n---\n{proposed_solution_markdown}\n---\n")
     current_proposed_operations = parse_file_operations(proposed_solution_markdown)
+    current_proposed_operations, proposer_conversation_run = await apply_proposed_patches(current_proposed_operations, proposer_conversation_run)
     logger.info(f"Code Proposer Output (Parsed Operations):")
     if current_proposed_operations:
         for op in current_proposed_operations:
@@ -436,54 +747,124 @@ async def solve_github_issue_flow(
     style_feedback = "N/A (No operations to review)"
     if current_proposed_operations and any(p.get('action') == 'modify' or p.get('action') == 'delete' for p in current_proposed_operations) :
         temp_proposed_operations = current_proposed_operations
+        # The issue context is identical in every cycle; build it once and keep it as the
+        # leading part of the review input so repeated reviews share a cacheable prompt prefix.
+        review_static_prefix = "\n".join([
+            f"Issue Title: {issue_title}\nIssue Number: {issue_number}\nIssue Body:\n{issue_body}\n",
+            f"Labels: {', '.join(issue_labels)}\n",
+            f"Overall Plan:\n{generated_plan}\n\nProposed File Operations:"
+        ])
+        # Approvals stick to the exact file operation a reviewer approved: (reviewer name,
+        # sha256 of the operation) -> review. Unchanged operations are not re-reviewed.
+        sticky_approvals: Dict[Tuple[str, str], str] = {}
+
+        async def review_file_operation(reviewer, file_section, review_input):
+            approval_key = (reviewer.name, hashlib.sha256(file_section.encode("utf-8")).hexdigest())
+            if approval_key in sticky_approvals:
+                logger.debug(f"[{reviewer.name}] Operation unchanged since it was approved; skipping review.")
+                return sticky_approvals[approval_key]
+            review = await run_reviewer_streamed(reviewer, review_input)
+            if is_review_approval(review):
+                sticky_approvals[approval_key] = review
+            return review
+
+        async def review_file_operation_combined(file_section, review_input):
+            # One run reviews the operation for both aspects. Approvals are stored under the
+            # per-aspect reviewers' names, so they stick the same way as separate reviews.
+            aspect_reviewers = (technical_reviewer, style_reviewer)
+            section_hash = hashlib.sha256(file_section.encode("utf-8")).hexdigest()
+            approval_keys = [(reviewer.name, section_hash) for reviewer in aspect_reviewers]
+            if all(key in sticky_approvals for key in approval_keys):
+                logger.debug(f"[{multi_aspect_reviewer.name}] Operation unchanged since it was approved; skipping review.")
+                return [sticky_approvals[key] for key in approval_keys]
+            review_run = await run_agent_and_track_usage(multi_aspect_reviewer, review_input)
+            reviews = multi_aspect_reviewer.parse_output(review_run.final_output)
+            if reviews is None:
+                logger.warning(f"[{multi_aspect_reviewer.name}] Could not parse the combined review; reviewing each aspect separately.")
+                return list(await asyncio.gather(*(
+                    review_file_operation(reviewer, file_section, review_input) for reviewer in aspect_reviewers
+                )))
+            for key, review in zip(approval_keys, reviews):
+                if is_review_approval(review):
+                    sticky_approvals[key] = review
+            return reviews
+
         for cycle in range(max_review_cycles):
             logger.info(f"\n🔄 Review Cycle {cycle + 1}/{max_review_cycles} 🔄")
-            review_input_parts = [
-                f"Issue Title: {issue_title}\nIssue Number: {issue_number}\nIssue Body:\n{issue_body}\n",
-                f"Labels: {', '.join(issue_labels)}\n",
-                f"Overall Plan:\n{generated_plan}\n\nProposed File Operations:"
-            ]
-            has_operations_to_review = False
+            review_sections = []
             for op in temp_proposed_operations: 
-                if op.get('action') == 'modify': review_input_parts.append(f"\n--- Modify/Create File: `{op['file_path']}` ---\n```\n{op['code']}\n```"); has_operations_to_review = True
-                elif op.get('action') == 'delete': review_input_parts.append(f"\n--- Delete File: `{op['file_path']}` ---"); has_operations_to_review = True
-                else: review_input_parts.append(f"\n--- File: `{op['file_path']}` ---\nNo changes proposed.")
-            if not has_operations_to_review: final_operations_to_commit = [p for p in temp_proposed_operations if p.get('action') != 'no_change']; break
-            review_task_input = "\n".join(review_input_parts)
-            logger.info("🕵️‍♂️ Requesting Technical Review...")
-            technical_review_run = await run_agent_and_track_usage(technical_reviewer, review_task_input)
-            tech_feedback = technical_review_run.final_output; logger.info(f"Technical Reviewer Output:\n{tech_feedback}\n")
-            logger.info("🎨 Requesting Style Review...")
-            style_review_run = await run_agent_and_track_usage(style_reviewer, review_task_input)
-            style_feedback = style_review_run.final_output; logger.info(f"Style Reviewer Output:\n{style_feedback}\n")
-            tech_ok = any(s in tech_feedback.lower() for s in ["lgtm", "satisfactory", "approved"])
-            style_ok = any(s in style_feedback.lower() for s in ["lgtm", "satisfactory", "approved"])
+                if op.get('action') == 'modify': review_sections.append((op['file_path'], f"\n--- Modify/Create File: `{op['file_path']}` ---\n```\n{op['code']}\n```"))
+                elif op.get('action') == 'delete': review_sections.append((op['file_path'], f"\n--- Delete File: `{op['file_path']}` ---"))
+            if not review_sections: final_operations_to_commit = [p for p in temp_proposed_operations if p.get('action') != 'no_change']; break
+            # Each file operation is reviewed on its own, so a multi-file proposal becomes several small
+            # concurrent reviews instead of one long one. Reviewers still see the list of all operations.
+            operations_overview = ""
+            if len(temp_proposed_operations) > 1:
+                operations_overview = "\n\nAll operations in this proposal (for context):\n" + "\n".join(
+                    f"- `{op['file_path']}`: {op.get('action')}" for op in temp_proposed_operations
+                )
+            logger.info(f"🕵️‍♂️🎨 Requesting Technical and Style Reviews for {len(review_sections)} file operation(s)...")
+            # Results are laid out as (technical, style) pairs, one pair per file operation. A job
+            # fills one slot, or both slots of its operation when the aspects are reviewed together.
+            if multi_aspect_reviewer is not None:
+                review_jobs = [
+                    ((2 * k, 2 * k + 1), multi_aspect_reviewer, section) for k, (_, section) in enumerate(review_sections)
+                ]
+            else:
+                review_jobs = [
+                    ((2 * k + j,), reviewer, section)
+                    for k, (_, section) in enumerate(review_sections)
+                    for j, reviewer in enumerate((technical_reviewer, style_reviewer))
+                ]
+
+            async def indexed_review(indices, reviewer, section):
+                review_input = f"{review_static_prefix}\n{section}{operations_overview}"
+                if reviewer is multi_aspect_reviewer:
+                    return indices, reviewer, await review_file_operation_combined(section, review_input)
+                return indices, reviewer, [await review_file_operation(reviewer, section, review_input)]
+
+            # Drain reviews as they finish. The first review that asks for changes decides the cycle:
+            # the proposer has to revise anyway, so the reviews still in flight are cancelled.
+            review_tasks = [asyncio.ensure_future(indexed_review(*job)) for job in review_jobs]
+            review_results: List[Optional[str]] = [None] * (2 * len(review_sections))
+            try:
+                for next_review in asyncio.as_completed(review_tasks):
+                    indices, reviewer, reviews = await next_review
+                    for index, review in zip(indices, reviews):
+                        review_results[index] = review
+                    if not all(is_review_approval(review) for review in reviews):
+                        pending_reviews = sum(1 for task in review_tasks if not task.done())
+                        if pending_reviews:
+                            logger.info(f"[{reviewer.name}] requested changes; cancelling {pending_reviews} pending review(s).")
+                        break
+            finally:
+                for task in review_tasks:
+                    task.cancel()
+            review_results = [review if review is not None else REVIEW_SKIPPED_TEXT for review in review_results]
+            reviewed_paths = [file_path for file_path, _ in review_sections]
+            tech_reviews, style_reviews = review_results[0::2], review_results[1::2]
+            tech_feedback = combine_file_reviews(reviewed_paths, tech_reviews)
+            style_feedback = combine_file_reviews(reviewed_paths, style_reviews)
+            logger.info(f"Technical Reviewer Output:\n{tech_feedback}\n")
+            logger.info(f"Style Reviewer Output:\n{style_feedback}\n")
+            tech_ok = all(is_review_approval(review) for review in tech_reviews)
+            style_ok = all(is_review_approval(review) for review in style_reviews)
             if tech_ok and style_ok: logger.info("✅ Both reviewers are satisfied."); final_operations_to_commit = [p for p in temp_proposed_operations if p.get('action') != 'no_change']; break
             if cycle < max_review_cycles_override - 1:
                 logger.warning("⚠️ Revision needed. Requesting CodeProposer to revise...")
-                revision_proposer_input_parts = [
-                    f"The following file operations for GitHub issue #{issue_number} ('{issue_title}') received feedback.",
-                    f"Overall Plan:\n{generated_plan}\n",
-                    "Current Proposed Operations (including original content for context if available):"
-                ]
-                for op in temp_proposed_operations: 
-                    original_content_for_op = original_file_contents.get(op['file_path'], "This file may be new, or its original content was not fetched/available.")
-                    if op.get('action') == 'modify': revision_proposer_input_parts.append(f"\n--- File: `{op['file_path']}` (Modify/Create) ---\nOriginal Content (or status):\n```\n{original_content_for_op}\n```\nProposed Code:\n```\n{op['code']}\n```")
-                    elif op.get('action') == 'delete': revision_proposer_input_parts.append(f"\n--- File: `{op['file_path']}` (Delete) ---\nOriginal Content (or status):\n```\n{original_content_for_op}\n```\n")
-                    else: revision_proposer_input_parts.append(f"\n--- File: `{op['file_path']}` (No Changes) ---")
-                revision_proposer_input_parts.append(f"\nFeedback:\nTechnical Review: {tech_feedback}\nStyle Review: {style_feedback}\n")
-                revision_proposer_input_parts.append(
-                    "Please provide a revised set of file operations. Remember to use the provided original content as the base for modifications. "
-                    "For each operation:\n"
-                    "- If creating or modifying a file: State 'Changes for `path/to/file.ext`:' followed by the ENTIRE NEW file content.\n"
-                    "- If deleting a file: State 'Delete file: `path/to/file.ext`'.\n"
-                    "- If a file no longer needs changes: State 'No changes needed for `path/to/file.ext`.'."
-                    "If the issue is vague, make a reasonable choice for a simple implementation. Clearly state any assumptions made."
+                # Continue the proposer's conversation: the issue, original file contents and its
+                # previous proposal are already in the history, so only the feedback is new input.
+                revision_message = (
+                    f"{REVISION_OPERATION_RULES}\nYour proposed file operations received feedback.\n"
+                    f"Feedback:\nTechnical Review: {tech_feedback}\nStyle Review: {style_feedback}\n"
                 )
-                proposer_run_revised = await run_agent_and_track_usage(code_proposer, "\n".join(revision_proposer_input_parts))
+                revision_input = proposer_conversation_run.to_input_list() + [{"role": "user", "content": revision_message}]
+                proposer_run_revised = await run_agent_and_track_usage(code_proposer, revision_input)
+                proposer_conversation_run = proposer_run_revised
                 revised_solution_markdown = proposer_run_revised.final_output
                 logger.debug(f"DEBUG: Code Proposer Revised Raw Output:\n---\n{revised_solution_markdown}\n---\n")
                 revised_operations = parse_file_operations(revised_solution_markdown)
+                revised_operations, proposer_conversation_run = await apply_proposed_patches(revised_operations, proposer_conversation_run)
                 if revised_operations: 
                     temp_proposed_operations = revised_operations
                     logger.info(f"Updated File Operations after revision (Parsed):")
@@ -498,53 +879,53 @@ async def solve_github_issue_flow(
             logger.warning("Review cycles completed, but solution not fully approved. Committing last valid operations with modifications or deletions.")
             final_operations_to_commit = [p for p in temp_proposed_operations if p.get('action') != 'no_change']
     
-    # --- Step 3: Creating/Ensuring Branch ---
-    logger.info("\n🌿 Step 3: Creating/Ensuring Branch...")
+    # --- Step 3: Creating/Ensuring Branch and Committing Code ---
     branch_prefix = "fix" 
     if any("enhancement" in label.lower() for label in issue_labels): branch_prefix = "feature"
     elif any("chore" in label.lower() for label in issue_labels): branch_prefix = "chore"
-    target_branch_name_ideal = f"{branch_prefix}/issue-{issue_number}"
-    branch_run = await run_agent_and_track_usage(branch_creator, f"Ensure branch for {repo_owner}/{repo_name} issue {issue_number}, prefix {branch_prefix}, base {default_branch_name}.")
-    branch_agent_summary = branch_run.final_output; actual_branch_name_from_tool = target_branch_name_ideal; branch_op_success = False
-    new_items_branch_check = getattr(branch_run, 'new_items', None)
-    if new_items_branch_check:
-        for _, item_br in enumerate(new_items_branch_check):
-            if type(item_br).__name__ == 'ToolCallOutputItem': 
-                content_br = getattr(item_br, 'output', getattr(item_br, 'content', None))
-                if content_br is None and hasattr(item_br, 'raw_item'):
-                    raw_br_item = item_br.raw_item; 
-                    if isinstance(raw_br_item, dict): content_br = raw_br_item
-                if isinstance(content_br, dict):
-                    if "error" not in content_br:
-                        branch_op_success = True; actual_branch_name_from_tool = content_br.get("branch_name", target_branch_name_ideal)
-                        if content_br.get("status") == "already_exists" or content_br.get("already_exists") is True: logger.info(f"Branch '{actual_branch_name_from_tool}' already exists.")
-                        else: logger.info(f"Branch '{actual_branch_name_from_tool}' creation/check successful.")
-                    else: 
-                        logger.error(f"Branch tool reported error: {content_br.get('error')}")
-                        branch_agent_summary = content_br.get('error', branch_agent_summary) + f" (Tool Output: {content_br})"
-                break 
-    if not branch_op_success:
-        logger.info(f"Branch Creator Agent Output (Summary): {branch_agent_summary}\n")
-        if "error" not in branch_agent_summary.lower() and ("created" in branch_agent_summary.lower() or "exists" in branch_agent_summary.lower() or "successful" in branch_agent_summary.lower()):
-            match_bn = re.search(r"(?:branch|')\s*`?([^'`]+)`?\s*(?:has been successfully created|already exists|creation/check successful)", branch_agent_summary, re.IGNORECASE)
-            if match_bn: actual_branch_name_from_tool = match_bn.group(1)
-            branch_op_success = True; logger.info(f"Branch operation likely successful. Target: {actual_branch_name_from_tool}")
-        else: logger.error(f"Branch operation failed or status unclear based on summary.")
-    final_target_branch = actual_branch_name_from_tool
-    
-    # --- Step 4: Committing Code ---
+    final_target_branch = f"{branch_prefix}/issue-{issue_number}"
+    branch_op_success = False
     commit_status_summary = "Commit skipped: No operations to commit or branch operation failed."
     change_explanations_for_comment: List[Dict[str,str]] = []
-    if final_operations_to_commit and branch_op_success:
-        logger.info(f"\n💾 Step 4: Applying File Operations to branch '{final_target_branch}'...")
+    if final_operations_to_commit:
+        # One agent turn and one tool call both ensure the branch and apply the operations.
+        logger.info(f"\n🌿💾 Step 3: Ensuring branch '{final_target_branch}' and applying file operations...")
         commit_message_base = f"Fix issue #{issue_number}: {issue_title}"
-        committer_input_payload = {"repo_owner": repo_owner, "repo_name": repo_name, "branch_name": final_target_branch, "commit_message_base": commit_message_base, "operations": final_operations_to_commit}
-        committer_input_str = (f"Apply the following file operations to repository {repo_owner}/{repo_name} on branch {final_target_branch}. Base commit message: '{commit_message_base}'.\n\nOperations: {json.dumps(committer_input_payload['operations'])}")
-        committer_run = await run_agent_and_track_usage(committer, committer_input_str)
-        commit_status_summary = committer_run.final_output
-        logger.info(f"Code Committer Agent Output:\n{commit_status_summary}\n")
-        if "error" not in commit_status_summary.lower() and "fail" not in commit_status_summary.lower() :
-            logger.info("\n✍️ Step 4.5: Generating Explanations for Changes...")
+        branch_and_commit_input = (
+            f"Ensure the branch for {repo_owner}/{repo_name} issue {issue_number} (prefix {branch_prefix}, base {default_branch_name}) "
+            f"and apply the following file operations to it. Base commit message: '{commit_message_base}'.\n\n"
+            f"Operations: {json.dumps(final_operations_to_commit)}"
+        )
+        branch_and_commit_run = await run_agent_and_track_usage(branch_and_committer, branch_and_commit_input)
+        commit_status_summary = branch_and_commit_run.final_output
+        logger.info(f"Branch and Commit Agent Output:\n{commit_status_summary}\n")
+
+        tool_result = extract_tool_outputs(getattr(branch_and_commit_run, 'new_items', None)).get('ensure_branch_and_commit')
+        if isinstance(tool_result, dict):
+            branch_result = tool_result.get("branch") or {}
+            if "error" not in branch_result:
+                branch_op_success = True
+                final_target_branch = tool_result.get("branch_name", final_target_branch)
+                if branch_result.get("status") == "already_exists": logger.info(f"Branch '{final_target_branch}' already exists.")
+                else: logger.info(f"Branch '{final_target_branch}' creation/check successful.")
+            else:
+                logger.error(f"Branch tool reported error: {branch_result.get('error')}")
+            commit_succeeded = "error" not in tool_result
+        else:
+            # No structured tool output; fall back to the agent's summary.
+            summary_lower = commit_status_summary.lower()
+            commit_succeeded = "error" not in summary_lower and "fail" not in summary_lower
+            branch_op_success = commit_succeeded
+
+        if commit_succeeded:
+            committed_branch = final_target_branch
+            committed_files = [op['file_path'] for op in final_operations_to_commit]
+            logger.info("\n✍️ Step 3.5: Generating Explanations for Changes...")
+            # Several changes are explained in one batched run; if its output cannot be matched to the
+            # changes, each change is explained separately (concurrently, as they are independent).
+            explained_operations: List[Dict[str, str]] = []
+            explainer_inputs: List[str] = []
+            explainer_changes: List[Dict[str, str]] = []
             for op in final_operations_to_commit:
                 original_code_for_explainer = original_file_contents.get(op['file_path'])
                 new_code_for_explainer = op.get('code')
@@ -552,41 +933,59 @@ async def solve_github_issue_flow(
                 elif op.get("action") == "modify": original_code_for_explainer = original_code_for_explainer if original_code_for_explainer is not None else "This is a new file (no original content)."; new_code_for_explainer = new_code_for_explainer if new_code_for_explainer is not None else "# Error: New code not found in operation proposal."
                 else: continue
                 explainer_input = (f"Original GitHub Issue Title: {issue_title}\nOriginal GitHub Issue Body:\n{issue_body}\n\nOverall Plan:\n{generated_plan}\n\nFile Path: {op['file_path']}\nAction Taken: {op['action']}\nOriginal Code Snippet (or status):\n{original_code_for_explainer}\n\nNew Code Snippet (or status):\n{new_code_for_explainer}\n\nExplain this specific change.")
-                explanation_run = await run_agent_and_track_usage(change_explainer, explainer_input)
-                change_explanations_for_comment.append({"file_path": op['file_path'], "action": op['action'], "explanation": explanation_run.final_output})
-                logger.debug(f"  Explanation for {op['file_path']} ({op['action']}): {explanation_run.final_output}")
-    elif not final_operations_to_commit:
-         commit_status_summary = "Commit skipped: No approved file operations to commit."
-         logger.warning(commit_status_summary)
+                explained_operations.append(op)
+                explainer_inputs.append(explainer_input)
+                explainer_changes.append({"file_path": op['file_path'], "action": op['action'], "original": original_code_for_explainer, "new": new_code_for_explainer})
+            explanations: Optional[List[str]] = None
+            if len(explained_operations) > 1:
+                batch_explainer_input = batch_change_explainer.build_input(issue_title, issue_body, generated_plan, explainer_changes)
+                batch_explanation_run = await run_agent_and_track_usage(batch_change_explainer, batch_explainer_input)
+                explanations = batch_change_explainer.parse_output(batch_explanation_run.final_output, [op['file_path'] for op in explained_operations])
+                if explanations is None:
+                    logger.warning("Batched change explanations could not be matched to the changes; explaining each change separately.")
+            if explanations is None:
+                explanation_runs = await asyncio.gather(*(run_agent_and_track_usage(change_explainer, explainer_input) for explainer_input in explainer_inputs))
+                explanations = [explanation_run.final_output for explanation_run in explanation_runs]
+            for op, explanation in zip(explained_operations, explanations):
+                change_explanations_for_comment.append({"file_path": op['file_path'], "action": op['action'], "explanation": explanation})
+                logger.debug(f"  Explanation for {op['file_path']} ({op['action']}): {explanation}")
     else:
-        commit_status_summary = f"Commit skipped due to branch operation failure ({branch_agent_summary})."
+        commit_status_summary = "Commit skipped: No approved file operations to commit."
         logger.warning(commit_status_summary)
     
     # --- Step 5: Posting Summary Comment ---
     logger.info("\n💬 Step 5: Posting Summary Comment...")
-    summary_comment_parts = [f"🤖 **OctoAgent Report** for Issue #{issue_number}: {issue_title}"]
-    summary_comment_parts.append(f"\n**Triage Summary:**\n{triage_output_summary}")
-    summary_comment_parts.append(f"\n**Generated Plan:**\n{generated_plan}")
-    if target_file_override: summary_comment_parts.append(f"\n**File Identification:**\nUser specified target file(s): `{', '.join(identified_file_paths_raw)}`.")
-    elif identified_file_paths_raw: summary_comment_parts.append(f"\n**File Identification:**\nAgent identified target file(s): `{', '.join(identified_file_paths_raw)}`.")
-    else: summary_comment_parts.append(f"\n**File Identification:**\nNo specific files were identified for modification.")
+    summary_buffer = io.StringIO()
+    summary_buffer.write(f"🤖 **OctoAgent Report** for Issue #{issue_number}: {issue_title}")
+
+    def write_section(header: str, content: Any) -> None:
+        # Sections without content are left out of the comment.
+        if content:
+            summary_buffer.write(header)
+            summary_buffer.write(str(content))
+
+    write_section(TRIAGE_SUMMARY_HEADER, triage_output_summary)
+    write_section(GENERATED_PLAN_HEADER, generated_plan)
+    if target_file_override: write_section(FILE_IDENTIFICATION_HEADER, f"User specified target file(s): `{', '.join(identified_file_paths_raw)}`.")
+    elif identified_file_paths_raw: write_section(FILE_IDENTIFICATION_HEADER, f"Agent identified target file(s): `{', '.join(identified_file_paths_raw)}`.")
+    else: write_section(FILE_IDENTIFICATION_HEADER, "No specific files were identified for modification.")
     if change_explanations_for_comment: 
-        summary_comment_parts.append(f"\n**Summary of Changes Applied:**")
-        for item in change_explanations_for_comment: summary_comment_parts.append(f"\n* **File:** `{item['file_path']}` ({item['action']})\n    * **Explanation:** {item['explanation']}")
-    elif final_operations_to_commit: summary_comment_parts.append(f"\n**Finalized File Operations (Commit Attempted but Explanations Skipped/Failed):**") 
-    elif current_proposed_operations and any(p.get('action') != 'no_change' for p in current_proposed_operations): summary_comment_parts.append(f"\n**Code Proposal Attempt:**\nOperations were proposed but not finalized.")
-    else: summary_comment_parts.append(f"\n**Code Proposal:** No file operations were proposed or committed.")
-    summary_comment_parts.append(f"\n**Technical Review:**\n{tech_feedback}")
-    summary_comment_parts.append(f"\n**Style Review:**\n{style_feedback}")
-    if branch_op_success: summary_comment_parts.append(f"\n**Branch:** `{final_target_branch}` (Created/Ensured)")
-    summary_comment_parts.append(f"\n**Commit Status:**\n{commit_status_summary}")
-    
-    footer_parts = ["\n---\n*This comment was automatically generated by OctoAgent, an experimental AI-powered issue-solving assistant.*"]
+        summary_buffer.write("\n\n**Summary of Changes Applied:**")
+        for item in change_explanations_for_comment: summary_buffer.write(f"\n\n* **File:** `{item['file_path']}` ({item['action']})\n    * **Explanation:** {item['explanation']}")
+    elif final_operations_to_commit: summary_buffer.write("\n\n**Finalized File Operations (Commit Attempted but Explanations Skipped/Failed):**") 
+    elif current_proposed_operations and any(p.get('action') != 'no_change' for p in current_proposed_operations): summary_buffer.write("\n\n**Code Proposal Attempt:**\nOperations were proposed but not finalized.")
+    else: summary_buffer.write("\n\n**Code Proposal:** No file operations were proposed or committed.")
+    write_section(TECHNICAL_REVIEW_HEADER, tech_feedback)
+    write_section(STYLE_REVIEW_HEADER, style_feedback)
+    if branch_op_success: summary_buffer.write(f"\n\n**Branch:** `{final_target_branch}` (Created/Ensured)")
+    write_section(COMMIT_STATUS_HEADER, commit_status_summary)
+
+    summary_buffer.write(COMMENT_FOOTER)
     if show_token_summary:
         overall_total_tokens_final = total_prompt_tokens + total_completion_tokens
-        footer_parts.append(f"*Model used: {actual_model_name_reported}, Total tokens: {overall_total_tokens_final} (Prompt: {total_prompt_tokens}, Completion: {total_completion_tokens})*")
-    summary_comment_parts.extend(footer_parts)
-    final_summary_comment = "\n".join(summary_comment_parts)
+        usage_note_final = f", excluding {reviews_stopped_early} review(s) stopped early" if reviews_stopped_early else ""
+        summary_buffer.write(f"\n*Model used: {actual_model_name_reported}, Total tokens: {overall_total_tokens_final} (Prompt: {total_prompt_tokens}, Completion: {total_completion_tokens}{usage_note_final})*")
+    final_summary_comment = summary_buffer.getvalue()
     comment_poster_run = await run_agent_and_track_usage(comment_poster, f"Post the following comment to {issue_url}: \n\n{final_summary_comment}")
     logger.info(f"Comment Poster Agent Output: {comment_poster_run.final_output}\n")
 
@@ -597,9 +996,12 @@ async def solve_github_issue_flow(
         logger.info(f"Total Prompt Tokens: {total_prompt_tokens}")
         logger.info(f"Total Completion Tokens: {total_completion_tokens}")
         logger.info(f"Overall Total Tokens: {overall_total_tokens}")
+        if reviews_stopped_early:
+            logger.info(f"Not counted: {reviews_stopped_early} review(s) stopped early on an approval, which report no usage.")
         logger.info("---------------------------\n")
 
     logger.info("=" * 50 + "\n✅ GitHub Issue Solver Flow Completed!\n")
+    return flow_result("completed")
 
 
 def main():
@@ -612,7 +1014,9 @@ def main():
     parser.add_argument(
         "repo_name", help="The name of the repository (e.g., 'octoragent')."
     )
-    parser.add_argument("issue_number", type=int, help="The issue number.")
+    parser.add_argument(
+        "issue_number", type=int, nargs="+", help="The issue number(s). Several issues are solved in one run."
+    )
     parser.add_argument(
         "--user_id",
         default="bgreenwell",
@@ -630,6 +1034,22 @@ def main():
         default=3,
         help='The maximum number of review cycles for code proposals. Defaults to 3.'
     )
+    parser.add_argument(
+        '--max_concurrent_issues',
+        type=int,
+        default=2,
+        help='The maximum number of issues solved concurrently when several are given. Defaults to 2.'
+    )
+    parser.add_argument(
+        '--combined_analysis',
+        action='store_true',
+        help='Triage, plan and identify target files with a single agent call instead of three.'
+    )
+    parser.add_argument(
+        '--combined_review',
+        action='store_true',
+        help='Review each file operation for technical correctness and style with a single agent call instead of two.'
+    )
     parser.add_argument(
         '--no_token_usage',
         action='store_true',
@@ -662,27 +1082,72 @@ def main():
     logger.info(f"Logging level set to: {args.log_level.upper()}")
 
 
-    issue_url = (
-        f"https://github.com/{args.user_id}/{args.repo_name}/issues/{args.issue_number}"
-    )
+    issue_urls = [
+        f"https://github.com/{args.user_id}/{args.repo_name}/issues/{issue_number}"
+        for issue_number in args.issue_number
+    ]
 
     if not os.environ.get("GITHUB_TOKEN"):
         logger.warning("GITHUB_TOKEN not set.")
     if not os.environ.get("OPENAI_API_KEY"):
         logger.warning("OpenAI API key not set.")
 
-    logger.info(f"--- Starting GitHub Issue Solver ---\nTargeting issue: {issue_url}")
-    asyncio.run(
-        solve_github_issue_flow(
-            issue_url=issue_url,
-            repo_owner_override=args.user_id,
-            repo_name_override=args.repo_name,
-            target_file_override=args.target_file,
-            max_review_cycles_override=args.max_review_cycles,
-            show_token_summary=(not args.no_token_usage),
-            model_to_use=args.model
-        )
-    )
+    logger.info(f"--- Starting GitHub Issue Solver ---\nTargeting issue(s): {', '.join(issue_urls)}")
+
+    async def run_flow():
+        # The flows are I/O-bound on the LLM and GitHub APIs, so one event loop can
+        # interleave several of them; the semaphore keeps the load on both APIs bounded.
+        issue_semaphore = asyncio.Semaphore(max(1, args.max_concurrent_issues))
+        # Open the LLM connection while the flows fetch the issues from GitHub.
+        warm_up_task = None
+        if os.environ.get("OCTOAGENT_NO_WARMUP", "").lower() not in ("1", "true", "yes"):
+            warm_up_task = asyncio.ensure_future(ReusableAgent.warm_up())
+
+        async def solve_one(issue_url, issue_context):
+            async with issue_semaphore:
+                return await solve_github_issue_flow(
+                    issue_url=issue_url,
+                    repo_owner_override=args.user_id,
+                    repo_name_override=args.repo_name,
+                    target_file_override=args.target_file,
+                    max_review_cycles_override=args.max_review_cycles,
+                    show_token_summary=(not args.no_token_usage),
+                    model_to_use=args.model,
+                    combined_analysis=args.combined_analysis,
+                    combined_review=args.combined_review,
+                    issue_context=issue_context
+                )
+
+        try:
+            # Several issues are fetched in one batch (one GraphQL request per chunk) and the
+            # default branch once, instead of one issue-context request per flow.
+            issue_contexts = [None] * len(issue_urls)
+            if len(issue_urls) > 1:
+                default_branch, issues = await asyncio.gather(
+                    github_client.get_default_branch(args.user_id, args.repo_name),
+                    github_client.get_issues_batch([(args.user_id, args.repo_name, number) for number in args.issue_number]),
+                )
+                issue_contexts = [{"issue": issue, "default_branch": default_branch} for issue in issues]
+
+            results = await asyncio.gather(
+                *(solve_one(issue_url, issue_context) for issue_url, issue_context in zip(issue_urls, issue_contexts)),
+                return_exceptions=True,
+            )
+            for issue_url, result in zip(issue_urls, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Solving {issue_url} failed: {result!r}", exc_info=result)
+                elif result and result.get("status") == "error":
+                    logger.error(f"Solving {issue_url} stopped early: {result.get('error')}")
+                elif result:
+                    logger.info(f"Solving {issue_url} finished with status '{result['status']}'; branch: {result.get('branch') or 'none'}.")
+        finally:
+            if warm_up_task is not None:
+                warm_up_task.cancel()
+            # The tools and the flow share one pooled HTTP session; close it
+            # while the event loop is still running.
+            await github_client.aclose()
+
+    asyncio.run(run_flow())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+"""
+Retry and circuit-breaker helpers for calls to the LLM provider.
+
+This module provides the CircuitBreaker class, which retries transient
+provider failures (rate limits, timeouts, connection and server errors) with
+exponential backoff and, once failures pile up, fails further calls fast
+instead of spending more requests against a provider that is down.
+"""
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+import logging
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+# Provider errors worth retrying; anything else is raised immediately.
+TRANSIENT_LLM_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is refused because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Retries transient failures and stops calling a failing service.
+
+    The breaker starts CLOSED. After `failure_threshold` consecutive transient
+    failures it turns OPEN and refuses calls with `CircuitOpenError` for
+    `reset_timeout` seconds. It then turns HALF_OPEN and lets calls through:
+    a success closes it again, a failure re-opens it.
+
+    Parameters
+    ----------
+    failure_threshold : int, optional
+        Consecutive transient failures that open the circuit, by default 5.
+    reset_timeout : float, optional
+        Seconds the circuit stays open before calls are tried again, by
+        default 30.
+    max_retries : int, optional
+        Times a call is retried after a transient failure, by default 2.
+    name : str, optional
+        A name used in log messages, by default "llm".
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_retries: int = 2, name: str = "llm"):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_retries = max_retries
+        self.name = name
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def _check_state(self) -> None:
+        """Raises CircuitOpenError if the circuit is open and not yet due for a retry."""
+        if self.state != self.OPEN:
+            return
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            logger.info(f"Circuit '{self.name}' is half-open; trying calls again.")
+            self.state = self.HALF_OPEN
+            return
+        raise CircuitOpenError(f"Circuit '{self.name}' is open after repeated failures; not calling the service.")
+
+    def record_success(self) -> None:
+        """Closes the circuit and resets the failure count."""
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit '{self.name}' closed.")
+        self.state = self.CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Counts a transient failure, opening the circuit when the threshold is reached."""
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit '{self.name}' opened after {self._failures} consecutive failure(s).")
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    async def call(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits `func()` with retries, unless the circuit is open.
+
+        Every retry calls `func()` again from the start, so only retry
+        functions that are safe to repeat; with `max_retries=0` the breaker
+        only fails fast.
+
+        Parameters
+        ----------
+        func : callable
+            A function returning a new awaitable on each call.
+
+        Returns
+        -------
+        object
+            The result of `func()`.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit is open when `func()` would be called, including
+            before a retry.
+        Exception
+            The last transient error, once retries are exhausted or the
+            failure opens the circuit; other errors immediately.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._check_state()
+            try:
+                result = await func()
+            except TRANSIENT_LLM_ERRORS as e:
+                self.record_failure()
+                if attempt == self.max_retries or self.state == self.OPEN:
+                    raise
+                delay = min(2 ** attempt, 30) + random.uniform(0, 1)
+                logger.warning(f"Transient error from '{self.name}' ({type(e).__name__}); retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries}).")
+                await asyncio.sleep(delay)
+                continue
+            self.record_success()
+            return result
@@ -5,6 +5,7 @@ This module defines the functions that agents can call to perform actions,
 such as downloading issues, creating branches, and listing files. It also
 contains helper utilities for parsing data.
 """
+import functools
 import os
 import re
 from typing import Any, Dict, List, Optional, Tuple 
@@ -16,6 +17,16 @@ from .github_client import GitHubClient
 
 logger = logging.getLogger(__name__)
 
+_GITHUB_URL_PREFIX = "https://github.com/"
+_ISSUE_URL_RE = re.compile(r"https://github\.com/([^/]+)/([^/]+)/issues/(\d+)")
+_CODE_FENCE_RE = re.compile(r"```(?:[a-zA-Z0-9\+\-\#\.]*?)?\s*\n(.*?)\n```", re.DOTALL)
+# Markers that suggest unfenced text is code (R and Python constructs).
+_CODE_HEURISTIC_RE = re.compile(
+    r"library\(|function\(|<-|#'|@param|@return|@examples|if \(|else \{|for \(|while \(|def |class "
+)
+# The header of a unified-diff hunk: @@ -old_start[,old_count] +new_start[,new_count] @@
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
 class FileChange(TypedDict):
     """
     Represents a single file change to be committed.
@@ -31,10 +42,14 @@ class FileChange(TypedDict):
     file_content: str
 
 
+@functools.lru_cache(maxsize=256)
 def parse_github_issue_url(issue_url: str) -> Optional[Tuple[str, str, int]]:
     """
     Parses a GitHub issue URL to extract owner, repo, and issue number.
 
+    Results are memoized, since the same URL is parsed by the flow and again
+    by each tool call that receives it.
+
     Parameters
     ----------
     issue_url : str
@@ -47,7 +62,12 @@ def parse_github_issue_url(issue_url: str) -> Optional[Tuple[str, str, int]]:
         A tuple containing the owner, repository name, and issue number,
         or None if the URL format is invalid.
     """
-    match = re.match(r"https://github\.com/([^/]+)/([^/]+)/issues/(\d+)", issue_url)
+    # Fast path for well-formed URLs; anything unusual falls through to the regex.
+    if issue_url.startswith(_GITHUB_URL_PREFIX):
+        parts = issue_url[len(_GITHUB_URL_PREFIX):].split('/', 4)
+        if len(parts) >= 4 and parts[0] and parts[1] and parts[2] == "issues" and parts[3].isdecimal():
+            return parts[0], parts[1], int(parts[3])
+    match = _ISSUE_URL_RE.match(issue_url)
     if match:
         owner, repo, issue_number_str = match.groups()
         return owner, repo, int(issue_number_str)
@@ -56,6 +76,14 @@ def parse_github_issue_url(issue_url: str) -> Optional[Tuple[str, str, int]]:
 
 github_client = GitHubClient()
 
+# Error results for input validation failures. These are shared between calls,
+# so treat them as read-only.
+_ERR_NO_TOKEN = {"error": "GITHUB_TOKEN not set."}
+_ERR_TOKEN_REQUIRED = {"error": "GITHUB_TOKEN is required."}
+_ERR_BAD_URL = {"error": "Invalid GitHub issue URL format."}
+_ERR_BAD_URL_DOWNLOAD = {"error": "Invalid GitHub issue URL format provided to download_github_issue."}
+_ERR_NO_FILE_CHANGES = {"error": "No file changes provided to commit."}
+
 @function_tool
 async def download_github_issue(issue_url: str) -> Dict[str, Any]:
     """
@@ -73,7 +101,7 @@ async def download_github_issue(issue_url: str) -> Dict[str, Any]:
     """
     parsed_url = parse_github_issue_url(issue_url)
     if not parsed_url: 
-        return {"error": "Invalid GitHub issue URL format provided to download_github_issue."}
+        return _ERR_BAD_URL_DOWNLOAD
     owner, repo, issue_number = parsed_url
     logger.info(f"Tool: Fetching issue details for {owner}/{repo}#{issue_number}...")
     return await github_client.get_issue_details(owner, repo, issue_number)
@@ -160,9 +188,14 @@ async def create_pr_branch(repo_owner: str, repo_name: str, issue_number: int, b
     dict
         A dictionary containing the branch creation status or an error message.
     """
+    return await _ensure_pr_branch(repo_owner, repo_name, issue_number, base_branch, branch_prefix)
+
+
+async def _ensure_pr_branch(repo_owner: str, repo_name: str, issue_number: int, base_branch: str, branch_prefix: str) -> Dict[str, Any]:
+    """Creates the branch for an issue unless it already exists. See `create_pr_branch`."""
     if not github_client.token: 
         logger.error("GITHUB_TOKEN not set for create_pr_branch tool.")
-        return {"error": "GITHUB_TOKEN not set."}
+        return _ERR_NO_TOKEN
     new_branch_name = f"{branch_prefix}/issue-{issue_number}"
     logger.info(f"Tool: Creating/Ensuring branch '{new_branch_name}' in {repo_owner}/{repo_name} from {base_branch}...")
     result = await github_client.create_branch(repo_owner, repo_name, new_branch_name, base_branch)
@@ -207,13 +240,18 @@ async def commit_files_to_branch(repo_owner: str, repo_name: str, branch_name: s
         A dictionary containing a summary of commit statuses for each file,
         or an error message if initial validation fails.
     """
+    return await _commit_file_changes(repo_owner, repo_name, branch_name, commit_message, file_changes_list)
+
+
+async def _commit_file_changes(repo_owner: str, repo_name: str, branch_name: str, commit_message: str, file_changes_list: List[FileChange]) -> Dict[str, Any]:
+    """Commits file creations/updates one by one. See `commit_files_to_branch`."""
     logger.info(f"Tool: Attempting to commit {len(file_changes_list)} file(s) to {repo_owner}/{repo_name}, branch '{branch_name}'")
     if not github_client.token:
         logger.error("GITHUB_TOKEN is required for commit_files_to_branch tool.")
-        return {"error": "GITHUB_TOKEN is required."}
+        return _ERR_TOKEN_REQUIRED
     if not file_changes_list:
         logger.warning("No file changes provided to commit_files_to_branch tool.")
-        return {"error": "No file changes provided to commit."}
+        return _ERR_NO_FILE_CHANGES
 
     commit_statuses = []
     overall_success = True
@@ -290,10 +328,15 @@ async def delete_file_from_branch(repo_owner: str, repo_name: str, branch_name:
     dict
         A dictionary containing the status of the deletion operation.
     """
+    return await _delete_file(repo_owner, repo_name, branch_name, file_path, commit_message)
+
+
+async def _delete_file(repo_owner: str, repo_name: str, branch_name: str, file_path: str, commit_message: str) -> Dict[str, Any]:
+    """Deletes a single file from a branch. See `delete_file_from_branch`."""
     logger.info(f"Tool: Attempting to delete file {repo_owner}/{repo_name}/{file_path} from branch '{branch_name}'")
     if not github_client.token:
         logger.error("GITHUB_TOKEN is required for delete_file_from_branch tool.")
-        return {"error": "GITHUB_TOKEN is required."}
+        return _ERR_TOKEN_REQUIRED
 
     file_sha = await github_client.get_file_sha(repo_owner, repo_name, file_path, branch_name)
     if not file_sha:
@@ -321,6 +364,142 @@ async def delete_file_from_branch(repo_owner: str, repo_name: str, branch_name:
             "status": "success"
         }
 
+@function_tool
+async def commit_tree(
+    repo_owner: str,
+    repo_name: str,
+    branch_name: str,
+    commit_message: str,
+    file_changes_list: List[FileChange],
+    files_to_delete: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Applies all file creations, modifications and deletions to a branch in a single commit.
+    Call this once with every operation instead of committing or deleting files one by one.
+
+    Parameters
+    ----------
+    repo_owner : str
+        The owner of the repository.
+    repo_name : str
+        The name of the repository.
+    branch_name : str
+        The branch to commit to.
+    commit_message : str
+        The commit message.
+    file_changes_list : list of FileChange
+        The files to create or update, each with 'file_path' and
+        'file_content'. May be empty if only deletions are needed.
+    files_to_delete : list of str, optional
+        Paths of files to delete from the branch, by default None.
+
+    Returns
+    -------
+    dict
+        A dictionary containing the commit details or an error message.
+    """
+    return await _commit_operations(repo_owner, repo_name, branch_name, commit_message, file_changes_list, files_to_delete)
+
+
+async def _commit_operations(
+    repo_owner: str,
+    repo_name: str,
+    branch_name: str,
+    commit_message: str,
+    file_changes_list: List[FileChange],
+    files_to_delete: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Commits all file operations as one Git tree. See `commit_tree`."""
+    logger.info(f"Tool: Committing {len(file_changes_list)} change(s) and {len(files_to_delete or [])} deletion(s) to {repo_owner}/{repo_name}, branch '{branch_name}'")
+    if not github_client.token:
+        logger.error("GITHUB_TOKEN is required for commit_tree tool.")
+        return _ERR_TOKEN_REQUIRED
+    if not file_changes_list and not files_to_delete:
+        logger.warning("No file operations provided to commit_tree tool.")
+        return _ERR_NO_FILE_CHANGES
+
+    file_changes = []
+    for i, change in enumerate(file_changes_list):
+        file_path = change.get("file_path")
+        file_content = change.get("file_content")
+        if not file_path or file_content is None:
+            logger.warning(f"Rejecting commit: item {i+1} is missing file_path or file_content.")
+            return {"error": f"File change {i+1} is missing file_path or file_content."}
+        file_changes.append((file_path, file_content))
+
+    result = await github_client.commit_file_operations(
+        owner=repo_owner,
+        repo=repo_name,
+        branch_name=branch_name,
+        commit_message=commit_message,
+        file_changes=file_changes,
+        files_to_delete=files_to_delete,
+    )
+    if "error" in result:
+        logger.error(f"Failed to commit file operations to {branch_name}: {result.get('error')}")
+    return result
+
+
+@function_tool
+async def ensure_branch_and_commit(
+    repo_owner: str,
+    repo_name: str,
+    issue_number: int,
+    base_branch: str,
+    commit_message: str,
+    file_changes_list: List[FileChange],
+    files_to_delete: Optional[List[str]] = None,
+    branch_prefix: str = "fix",
+) -> Dict[str, Any]:
+    """
+    Ensures the branch for an issue exists and applies file operations to it.
+
+    This combines `create_pr_branch` and `commit_tree` in one call: all
+    deletions, creations and modifications land in a single commit, so
+    renames work as expected.
+
+    Parameters
+    ----------
+    repo_owner : str
+        The owner of the repository.
+    repo_name : str
+        The name of the repository.
+    issue_number : int
+        The issue number to associate with the branch.
+    base_branch : str
+        The name of the base branch to branch from.
+    commit_message : str
+        The commit message.
+    file_changes_list : list of FileChange
+        The files to create or update, each with 'file_path' and
+        'file_content'. May be empty if only deletions are needed.
+    files_to_delete : list of str, optional
+        Paths of files to delete from the branch, by default None.
+    branch_prefix : str, optional
+        The prefix for the new branch name (e.g., 'fix', 'feature'),
+        by default "fix".
+
+    Returns
+    -------
+    dict
+        A dictionary with the branch name, the branch status, and the
+        result of the commit, or an error message.
+    """
+    branch_result = await _ensure_pr_branch(repo_owner, repo_name, issue_number, base_branch, branch_prefix)
+    if "error" in branch_result:
+        return {"error": f"Branch operation failed: {branch_result['error']}", "branch": branch_result}
+    branch_name = branch_result["branch_name"]
+
+    commit_result = await _commit_operations(repo_owner, repo_name, branch_name, commit_message, file_changes_list, files_to_delete)
+    result: Dict[str, Any] = {"branch_name": branch_name, "branch": branch_result, "commit": commit_result}
+    if "error" in commit_result:
+        result["message"] = "The file operations could not be committed."
+        result["error"] = f"Commit failed: {commit_result['error']}"
+    else:
+        result["message"] = f"All file operations applied to branch '{branch_name}' in commit {commit_result.get('commit_sha')}."
+    return result
+
+
 @function_tool
 async def post_comment_to_github(issue_url: str, comment_body: str) -> Dict[str, Any]:
     """
@@ -340,9 +519,9 @@ async def post_comment_to_github(issue_url: str, comment_body: str) -> Dict[str,
     """
     if not github_client.token: 
         logger.error("GITHUB_TOKEN not set for post_comment_to_github tool.")
-        return {"error": "GITHUB_TOKEN not set."}
+        return _ERR_NO_TOKEN
     parsed_url = parse_github_issue_url(issue_url)
-    if not parsed_url: return {"error": "Invalid GitHub issue URL format."}
+    if not parsed_url: return _ERR_BAD_URL
     owner, repo, issue_number = parsed_url
     logger.info(f"Tool: Posting comment to {owner}/{repo}#{issue_number}...")
     result = await github_client.add_comment_to_issue(owner, repo, issue_number, comment_body)
@@ -356,18 +535,123 @@ async def post_comment_to_github(issue_url: str, comment_body: str) -> Dict[str,
 def extract_code_from_markdown(markdown_text: Optional[str]) -> Optional[str]:
     """
     Extracts a code block from a markdown string.
-    # ... (docstring)
+
+    Parameters
+    ----------
+    markdown_text : str or None
+        The markdown text, typically an agent's output.
+
+    Returns
+    -------
+    str or None
+        The contents of the first fenced code block, the whole text if it
+        looks like bare code, or None if no code could be found.
     """
     if not markdown_text:
         return None
-    # ... (logic remains the same)
-    match = re.search(r"```(?:[a-zA-Z0-9\+\-\#\.]*?)?\s*\n(.*?)\n```", markdown_text, re.DOTALL)
+    match = _CODE_FENCE_RE.search(markdown_text)
     if match:
         return match.group(1).strip()
     stripped_text = markdown_text.strip()
     # Heuristic check if it's just code without backticks
-    if not stripped_text.startswith("```") and \
-       any(kw in stripped_text for kw in ["library(", "function(", "<-", "#'", "@param", "@return", "@examples", "if (", "else {", "for (", "while (", "def ", "class "]):
+    if not stripped_text.startswith("```") and _CODE_HEURISTIC_RE.search(stripped_text):
         return stripped_text
     logger.debug(f"Could not extract code from markdown: {markdown_text[:100]}...") # Optional: log if no extraction
     return None
+
+
+def _split_lines(text: str) -> List[str]:
+    """
+    Splits text into lines on LF only, dropping a CR before each LF.
+
+    Unlike `str.splitlines`, this keeps form feeds and the other characters
+    Python also treats as line boundaries inside their lines.
+    """
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+
+def apply_unified_diff(original: str, diff: str) -> str:
+    """
+    Applies a single-file unified diff to a file's content.
+
+    Hunks are located by their context and removed lines rather than by the
+    line numbers in their headers alone, since model-written diffs often get
+    the numbers slightly wrong: each hunk goes to the matching position
+    closest to the one its header states. Trailing whitespace is ignored when
+    matching, and an empty line inside a hunk is taken as an empty context
+    line. The patched content keeps the original's line endings (CRLF if the
+    original uses them).
+
+    Parameters
+    ----------
+    original : str
+        The original file content.
+    diff : str
+        The unified diff, with or without '---'/'+++' file headers.
+
+    Returns
+    -------
+    str
+        The patched content.
+
+    Raises
+    ------
+    ValueError
+        If the diff has no hunks, contains malformed lines, or a hunk does
+        not match the original content.
+    """
+    newline = "\r\n" if "\r\n" in original else "\n"
+    source_lines = _split_lines(original)
+    # (old start line, old count, old lines, new lines) for each hunk.
+    hunks: List[Tuple[int, int, List[str], List[str]]] = []
+    for line in _split_lines(diff.rstrip("\r\n")):
+        header = _HUNK_HEADER_RE.match(line)
+        if header:
+            old_count = int(header.group(2)) if header.group(2) is not None else 1
+            hunks.append((int(header.group(1)), old_count, [], []))
+            continue
+        if not hunks or line.startswith("\\"):
+            # File headers before the first hunk, and "\ No newline at end of file".
+            continue
+        _, _, old_lines, new_lines = hunks[-1]
+        tag, text = line[:1], line[1:]
+        if tag in (" ", ""):
+            old_lines.append(text)
+            new_lines.append(text)
+        elif tag == "-":
+            old_lines.append(text)
+        elif tag == "+":
+            new_lines.append(text)
+        else:
+            raise ValueError(f"Unexpected line in diff hunk: {line!r}")
+    if not hunks:
+        raise ValueError("The diff contains no hunks.")
+
+    patched_lines: List[str] = []
+    cursor = 0
+    for old_start, old_count, old_lines, new_lines in hunks:
+        if not old_lines:
+            # A pure insertion after line `old_start` (0 inserts at the top).
+            position = min(max(old_start if old_count == 0 else old_start - 1, cursor), len(source_lines))
+        else:
+            expected = max(old_start - 1, cursor)
+            wanted = [old_line.rstrip() for old_line in old_lines]
+            candidates = [
+                start for start in range(cursor, len(source_lines) - len(old_lines) + 1)
+                if [source_line.rstrip() for source_line in source_lines[start:start + len(old_lines)]] == wanted
+            ]
+            if not candidates:
+                raise ValueError(f"The hunk starting at line {old_start} does not match the original content.")
+            position = min(candidates, key=lambda start: abs(start - expected))
+        patched_lines.extend(source_lines[cursor:position])
+        patched_lines.extend(new_lines)
+        cursor = position + len(old_lines)
+    patched_lines.extend(source_lines[cursor:])
+
+    patched = newline.join(patched_lines)
+    if patched_lines and (original.endswith("\n") or not original):
+        patched += newline
+    return patched
@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("agents")
+pytest.importorskip("aiohttp")
+
+from octoagent.agents import CommentPosterAgent, IssueTriagerAgent, ReusableAgent
+from octoagent.cache import llm_cache
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+
+    async def fake_run_uncached(self, user_input, **kwargs):
+        calls.append((self.name, user_input))
+        return f"output for {user_input}"
+
+    monkeypatch.setattr(ReusableAgent, "_run_uncached", fake_run_uncached)
+    monkeypatch.setattr(llm_cache, "enabled", True)
+    monkeypatch.delenv("OCTOAGENT_NO_CACHE", raising=False)
+    llm_cache.clear()
+    yield calls
+    llm_cache.clear()
+
+
+def test_run_cached_sync_reuses_cacheable_responses(model_calls):
+    triager = IssueTriagerAgent()
+    assert triager.run_cached_sync("issue 1") == "output for issue 1"
+    assert triager.run_cached_sync("issue 1") == "output for issue 1"
+    assert len(model_calls) == 1
+
+
+def test_run_cached_sync_always_runs_tool_agents(model_calls):
+    poster = CommentPosterAgent()
+    poster.run_cached_sync("post a comment")
+    poster.run_cached_sync("post a comment")
+    assert len(model_calls) == 2
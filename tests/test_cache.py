@@ -0,0 +1,33 @@
+import sqlite3
+import time
+
+from octoagent.cache import DiskCache, LLMCache
+
+
+def test_disk_cache_ignores_entries_older_than_ttl(tmp_path):
+    store = DiskCache(str(tmp_path / "responses.sqlite"))
+    store.set("key", "LGTM!")
+    assert store.get("key", ttl=60) == "LGTM!"
+    with sqlite3.connect(store.path) as connection:
+        connection.execute("UPDATE responses SET created_at = ?", (time.time() - 120,))
+    assert store.get("key", ttl=60) is None
+    assert store.get("key") == "LGTM!"
+
+
+def test_disk_cache_reads_databases_without_timestamps(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        connection.execute("INSERT INTO responses (key, value) VALUES ('old', 'Approved')")
+    store = DiskCache(path)
+    assert store.get("old") == "Approved"
+    assert store.get("old", ttl=3600) is None
+    store.set("new", "LGTM!")
+    assert store.get("new", ttl=3600) == "LGTM!"
+
+
+def test_llm_cache_applies_ttl_to_stored_entries(tmp_path):
+    store = DiskCache(str(tmp_path / "responses.sqlite"))
+    LLMCache(enabled=True, store=store).set("key", "LGTM!")
+    assert LLMCache(enabled=True, store=store).get("key") == "LGTM!"
+    assert LLMCache(ttl=0, enabled=True, store=store).get("key") is None
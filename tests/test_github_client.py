@@ -0,0 +1,202 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from octoagent import github_client as github_client_module
+from octoagent.github_client import GitHubClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    return GitHubClient()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(github_client_module.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def rate_limit_headers(remaining, limit):
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(time.time() + 3600),
+        "X-RateLimit-Resource": "core",
+    }
+
+
+def test_unauthenticated_limit_does_not_wait_while_requests_remain(client, sleeps):
+    client._record_rate_limit(rate_limit_headers(remaining=59, limit=60))
+    asyncio.run(client._wait_for_rate_limit("core"))
+    client._record_rate_limit(rate_limit_headers(remaining=1, limit=60))
+    asyncio.run(client._wait_for_rate_limit("core"))
+    assert sleeps == []
+
+
+def test_unauthenticated_limit_waits_when_exhausted(client, sleeps):
+    client._record_rate_limit(rate_limit_headers(remaining=0, limit=60))
+    asyncio.run(client._wait_for_rate_limit("core"))
+    assert len(sleeps) == 1
+
+
+def test_authenticated_limit_keeps_a_buffer(client, sleeps):
+    client._record_rate_limit(rate_limit_headers(remaining=150, limit=5000))
+    asyncio.run(client._wait_for_rate_limit("core"))
+    assert sleeps == []
+    client._record_rate_limit(rate_limit_headers(remaining=50, limit=5000))
+    asyncio.run(client._wait_for_rate_limit("core"))
+    assert len(sleeps) == 1
+
+
+def graphql_issue(number):
+    return {
+        "number": number, "title": f"Issue {number}", "body": "", "url": f"https://github.com/o/r/issues/{number}",
+        "state": "OPEN", "createdAt": None, "updatedAt": None, "author": {"login": "someone"},
+        "labels": {"nodes": []}, "comments": {"totalCount": 0},
+    }
+
+
+def test_issues_batch_keeps_valid_issues_when_one_is_missing(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    client = GitHubClient()
+    body = {
+        "data": {
+            "i0": {"issue": graphql_issue(1)},
+            "i1": {"issue": None},
+            "i2": {"issue": graphql_issue(3)},
+            "rateLimit": None,
+        },
+        "errors": [{
+            "type": "NOT_FOUND",
+            "path": ["i1", "issue"],
+            "message": "Could not resolve to an issue or pull request with the number of 2.",
+        }],
+    }
+
+    async def fake_request(method, endpoint, **kwargs):
+        return 200, body, None
+
+    monkeypatch.setattr(client, "_make_request", fake_request)
+    results = asyncio.run(client.get_issues_batch([("o", "r", 1), ("o", "r", 2), ("o", "r", 3)]))
+
+    assert [result.get("number") for result in results] == [1, None, 3]
+    assert results[1]["status"] == "not_found"
+    assert "o/r#2 not found" in results[1]["error"]
+
+
+def test_issue_context_reports_missing_issue_with_default_branch(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    client = GitHubClient()
+    body = {
+        "data": {"repository": {"defaultBranchRef": {"name": "main", "target": {"oid": "abc", "tree": {"oid": "def"}}}, "issue": None}},
+        "errors": [{"type": "NOT_FOUND", "path": ["repository", "issue"], "message": "Could not resolve to an issue."}],
+    }
+
+    async def fake_request(method, endpoint, **kwargs):
+        return 200, body, None
+
+    monkeypatch.setattr(client, "_make_request", fake_request)
+    context = asyncio.run(client.get_issue_context("o", "r", 7))
+
+    assert context["default_branch"] == "main"
+    assert context["issue"]["status"] == "not_found"
+
+
+def test_issue_context_falls_back_to_rest_for_default_branch(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    client = GitHubClient()
+
+    async def fake_request(method, endpoint, **kwargs):
+        if endpoint == "/graphql":
+            return 403, {"message": "Resource not accessible by integration"}, None
+        return 200, {"default_branch": "trunk"}, None
+
+    monkeypatch.setattr(client, "_make_request", fake_request)
+    context = asyncio.run(client.get_issue_context("o", "r", 7))
+
+    assert context["default_branch"] == "trunk"
+    assert "error" in context["issue"]
+
+
+def test_commit_file_operations_keeps_existing_file_modes(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    client = GitHubClient()
+    client._branch_heads[("o", "r", "fix")] = ("head-commit", "head-tree")
+    posted_trees = []
+
+    async def fake_request(method, endpoint, **kwargs):
+        if endpoint.endswith("/git/blobs"):
+            return 201, {"sha": "blob-" + kwargs["json"]["content"]}, None
+        if endpoint.startswith("/repos/o/r/git/trees/head-tree"):
+            return 200, {"tree": [
+                {"path": "run.sh", "mode": "100755", "type": "blob"},
+                {"path": "link", "mode": "120000", "type": "blob"},
+                {"path": "src", "mode": "040000", "type": "tree"},
+            ]}, None
+        if endpoint.endswith("/git/trees"):
+            posted_trees.append(kwargs["json"]["tree"])
+            return 201, {"sha": "new-tree"}, None
+        if endpoint.endswith("/git/commits"):
+            return 201, {"sha": "new-commit"}, None
+        return 200, {}, None
+
+    monkeypatch.setattr(client, "_make_request", fake_request)
+    result = asyncio.run(client.commit_file_operations(
+        "o", "r", "fix", "Update files", [("run.sh", "echo"), ("link", "target"), ("new.py", "x = 1")]
+    ))
+
+    assert result["commit_sha"] == "new-commit"
+    assert {entry["path"]: entry["mode"] for entry in posted_trees[0]} == {
+        "run.sh": "100755", "link": "120000", "new.py": "100644",
+    }
+
+
+def test_create_commit_on_branch_keeps_executable_mode(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    client = GitHubClient()
+    client._branch_heads[("o", "r", "fix")] = ("head-commit", "head-tree")
+    posted_trees = []
+
+    async def fake_request(method, endpoint, **kwargs):
+        if endpoint.endswith("/git/blobs"):
+            return 201, {"sha": "blob"}, None
+        if endpoint.startswith("/repos/o/r/git/trees/head-tree"):
+            return 200, {"tree": [{"path": "run.sh", "mode": "100755", "type": "blob"}]}, None
+        if endpoint.endswith("/git/trees"):
+            posted_trees.append(kwargs["json"]["tree"])
+            return 201, {"sha": "new-tree"}, None
+        if endpoint.endswith("/git/commits"):
+            return 201, {"sha": "new-commit"}, None
+        return 200, {}, None
+
+    monkeypatch.setattr(client, "_make_request", fake_request)
+    asyncio.run(client.create_commit_on_branch("o", "r", "fix", "Update run.sh", "run.sh", "echo"))
+
+    assert posted_trees[0][0]["mode"] == "100755"
+
+
+def test_issues_batch_serves_later_issue_lookups(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    client = GitHubClient()
+    requests = []
+
+    async def fake_request(method, endpoint, **kwargs):
+        requests.append(endpoint)
+        return 200, {"data": {"i0": {"issue": graphql_issue(1)}, "rateLimit": None}}, None
+
+    monkeypatch.setattr(client, "_make_request", fake_request)
+    asyncio.run(client.get_issues_batch([("o", "r", 1)]))
+    issue = asyncio.run(client.get_issue_details("o", "r", 1))
+
+    assert issue["number"] == 1
+    assert requests == ["/graphql"]
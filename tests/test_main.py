@@ -0,0 +1,21 @@
+import pytest
+
+pytest.importorskip("agents")
+pytest.importorskip("aiohttp")
+
+from octoagent.main import is_review_approval
+
+
+@pytest.mark.parametrize("review", ["LGTM!", "Satisfactory", "Approved", "**Approved**", "  lgtm"])
+def test_approval_verdicts(review):
+    assert is_review_approval(review)
+
+
+@pytest.mark.parametrize("review", [
+    "Needs revision. src/app.py: once the missing import is fixed this would be approved.",
+    "Needs revision. LGTM apart from the failing test in tests/test_app.py.",
+    "The change looks satisfactory overall, but needs revision in src/app.py.",
+    "Not reviewed in this cycle: another review already requested changes.",
+])
+def test_revision_requests_are_not_approvals(review):
+    assert not is_review_approval(review)
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("agents")
+pytest.importorskip("aiohttp")
+
+from octoagent.tools import apply_unified_diff
+
+
+DIFF = "@@ -1,2 +1,3 @@\n def func_a():\n     pass\n+# done\n"
+
+
+def test_apply_unified_diff_keeps_lf_line_endings():
+    assert apply_unified_diff("def func_a():\n    pass\n", DIFF) == "def func_a():\n    pass\n# done\n"
+
+
+def test_apply_unified_diff_keeps_crlf_line_endings():
+    patched = apply_unified_diff("def func_a():\r\n    pass\r\n", DIFF)
+    assert patched == "def func_a():\r\n    pass\r\n# done\r\n"
+
+
+def test_apply_unified_diff_accepts_crlf_diffs():
+    patched = apply_unified_diff("def func_a():\r\n    pass\r\n", DIFF.replace("\n", "\r\n"))
+    assert patched == "def func_a():\r\n    pass\r\n# done\r\n"
+
+
+def test_apply_unified_diff_keeps_form_feeds():
+    diff = "@@ -1,3 +1,3 @@\n-x = 1\n+x = 3\n \x0c\n y = 2\n"
+    assert apply_unified_diff("x = 1\n\x0c\ny = 2\n", diff) == "x = 3\n\x0c\ny = 2\n"
+
+
+def test_apply_unified_diff_does_not_split_lines_on_form_feeds():
+    diff = "@@ -1,2 +1,2 @@\n a\x0cb\n-c\n+C\n"
+    assert apply_unified_diff("a\x0cb\nc\n", diff) == "a\x0cb\nC\n"